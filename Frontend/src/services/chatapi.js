@@ -5,6 +5,9 @@ import axiosInstance from "./axiosInstance";
 // Guest Chat (no login)
 // ---------------------
 const PUBLIC_API_URL = "http://localhost:8000/chat/";
+// The backend keeps guest chat context per session; echo its id back so
+// follow-ups ("cafes" -> "in Berlin") build on the previous message
+const GUEST_SESSION_KEY = "guestChatSessionId";
 
 /**
  * Sends a chat message for guest (non-logged in user).
@@ -13,12 +16,14 @@ const PUBLIC_API_URL = "http://localhost:8000/chat/";
  */
 export async function sendChatMessage(message) {
   try {
+    const sessionId = sessionStorage.getItem(GUEST_SESSION_KEY);
     const response = await fetch(PUBLIC_API_URL, {
       method: "POST",
+      credentials: "include", // send/receive the chat_session cookie
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify({ message }),
+      body: JSON.stringify(sessionId ? { message, session_id: sessionId } : { message }),
     });
 
     if (!response.ok) {
@@ -26,6 +31,9 @@ export async function sendChatMessage(message) {
     }
 
     const data = await response.json();
+    if (data.session_id) {
+      sessionStorage.setItem(GUEST_SESSION_KEY, data.session_id);
+    }
     return data.response || data; // flexible for guest chat
   } catch (error) {
     console.error("Error sending guest chat message:", error);
@@ -8,9 +8,23 @@ export const createLead = async (leadData) => {
   return response.data;
 };
 
+// One keyset page: { items, nextCursor } (nextCursor is null on the last page)
+export const listLeadsPage = async (filters = {}, cursor = null) => {
+  const params = cursor ? { ...filters, cursor } : filters;
+  const response = await api.get(API_BASE_URL + "/", { params });
+  return { items: response.data, nextCursor: response.headers["x-next-cursor"] || null };
+};
+
+// All matching leads: follows X-Next-Cursor until the last page
 export const listLeads = async (filters = {}) => {
-  const response = await api.get(API_BASE_URL + "/", { params: filters });
-  return response.data;
+  const leads = [];
+  let cursor = null;
+  do {
+    const page = await listLeadsPage({ limit: 200, ...filters }, cursor);
+    leads.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return leads;
 };
 
 export const getLeadsCount = async (filters = {}) => {
@@ -8,7 +8,7 @@ from app.db.session import get_session
 from app.models.users import User
 from app.models.refresh_token import RefreshToken
 from app.schemas.users import UserRegister, UserLogin, UserRead, Token, TokenRefresh
-from app.utils.jwt import create_access_token, verify_refresh_token
+from app.utils.jwt import verify_refresh_token
 from app.dependencies.dependencies import get_current_user, get_user_or_none
 from app.services.auth_service import AuthService
 
@@ -40,7 +40,7 @@ async def login(
             detail="Invalid credentials"
         )
 
-    access_token = create_access_token(db_user.id)
+    access_token = await auth.issue_access_token(db_user.id)
     refresh_token = await auth.create_and_store_refresh_token(db_user, revoke_old=True)
 
     # 🔹 Cookie settings (adjust for production)
@@ -98,7 +98,7 @@ async def refresh(request: Request, response: Response, body: Optional[TokenRefr
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    new_access = create_access_token(user.id)
+    new_access = await auth.issue_access_token(user.id)
     new_refresh = await auth.create_and_store_refresh_token(user)
 
     # Set cookies
@@ -1,33 +1,91 @@
-from fastapi import APIRouter, Depends
+import json
+import uuid
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.session import get_session
 from app.schemas.chat import ChatRequest
-from app.services.chat_service import chat
-from app.core.config import get_settings  # your settings loader
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.models.users import User
-from app.dependencies.dependencies import get_user_or_none , get_current_user # optional user dependency
-
-settings = get_settings()
+from app.services.chat_service import chat, chat_stream
+from app.services.places_cache import get_places_cache
+from app.services import intent_extractor
+from app.core.llm import get_llm
+from app.services.principal_cache import Principal
+from app.dependencies.dependencies import get_principal_or_none, get_current_principal # optional user dependency
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 # Shared LLM instance
-llm = ChatGoogleGenerativeAI(
-    model=settings.GEMINI_MODEL,
-    google_api_key=settings.GEMINI_API_KEY,
-)
+llm = get_llm()
+
+CHAT_SESSION_COOKIE = "chat_session"
+
+
+def _guest_session_id(request: Request, payload: ChatRequest) -> str:
+    """Guests get their own context key, kept in a cookie (or sent in the body)"""
+    return payload.session_id or request.cookies.get(CHAT_SESSION_COOKIE) or uuid.uuid4().hex
+
+
+def _set_session_cookie(response: Response, session_id: str) -> None:
+    response.set_cookie(CHAT_SESSION_COOKIE, session_id, max_age=60 * 60 * 24, httponly=True, samesite="Lax", path="/")
 
 @router.post("/")
 async def chat_leads(
     payload: ChatRequest,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
-    user: User | None = Depends(get_user_or_none),
+    user: Principal | None = Depends(get_principal_or_none),
 ):
-    response = await chat(
+    session_id = None if user else _guest_session_id(request, payload)
+    result = await chat(
         message=payload.message,
         db=db,
         llm=llm,
-        user=user
+        user=user,
+        refresh=payload.refresh,
+        session_id=session_id,
     )
+    if session_id:
+        _set_session_cookie(response, session_id)
+        result["session_id"] = session_id
+    return result
+
+@router.post("/stream")
+async def chat_leads_stream(
+    payload: ChatRequest,
+    request: Request,
+    user: Principal | None = Depends(get_principal_or_none),
+):
+    """Server-Sent Events version of POST /chat/"""
+    session_id = None if user else _guest_session_id(request, payload)
+
+    async def event_source():
+        try:
+            async for event, data in chat_stream(
+                message=payload.message,
+                llm=llm,
+                user=user,
+                refresh=payload.refresh,
+                session_id=session_id,
+            ):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            print("⚠️ Chat stream failed:", e)
+            yield f"event: error\ndata: {json.dumps({'detail': 'Chat stream failed'})}\n\n"
+
+    response = StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    if session_id:
+        _set_session_cookie(response, session_id)
     return response
+
+@router.get("/metrics")
+async def chat_metrics(user: Principal = Depends(get_current_principal)):
+    return {
+        "places_cache": get_places_cache().stats(),
+        "intent_extraction": intent_extractor.get_metrics(),
+    }
@@ -1,15 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List, Optional
+from typing import Any, List, Optional, Literal, Union
+import orjson
 import uuid
-from app.dependencies.dependencies import get_current_user, get_user_or_none
+from app.dependencies.dependencies import get_current_principal
+from app.services.principal_cache import Principal
 from app.db.session import get_session
-from app.services.lead_service import LeadService
-from app.schemas.lead import LeadRead, LeadCreate, LeadUpdate
-from app.models.users import User
+from app.services.lead_service import LeadService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, export_leads, resolve_fields
+from app.services.lead_import_service import LeadImportService
+from app.schemas.lead import (
+    LeadRead, LeadPreviewRead, LeadCreate, LeadUpdate, LeadEnrichmentStatus, LeadPage, LeadStatsRead, LeadImportResult,
+    LeadBulkUpdate, LeadBulkDelete, LeadBulkResult,
+)
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
 
+
+class LeadJSONResponse(ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes as "...Z", as Pydantic does,
+    so these routes keep the format the response_model used to produce."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z)
+
+
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    return [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+
 # Create lead
 @router.post("/", response_model=LeadRead)
 async def create_lead(data: LeadCreate, session: AsyncSession = Depends(get_session)):
@@ -17,23 +36,81 @@ async def create_lead(data: LeadCreate, session: AsyncSession = Depends(get_sess
     lead_dict = await service.create_lead(data)
     return LeadRead.model_validate(lead_dict)
 
-# List leads
-@router.get("/", response_model=List[LeadRead])
+# Bulk import leads from a CSV or NDJSON upload
+@router.post("/import", response_model=LeadImportResult)
+async def import_leads(
+    file: UploadFile = File(..., description="CSV with a header row of lead fields, or NDJSON (one lead object per line)"),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults to the file extension"),
+    session: AsyncSession = Depends(get_session),
+    user: Principal = Depends(get_current_principal),
+):
+    fmt = format or ("ndjson" if (file.filename or "").lower().endswith((".ndjson", ".jsonl")) else "csv")
+    service = LeadImportService(session)
+    report = await service.import_leads(file.file, fmt, user.id)
+    return LeadImportResult.model_validate(report)
+
+# List leads (keyset paginated; next page cursor in the X-Next-Cursor header).
+# Read routes return service rows straight through LeadJSONResponse; response_model
+# only documents the shape.
+@router.get("/", response_model=List[Union[LeadRead, LeadPreviewRead]])
 async def list_leads(
     industry: Optional[str] = Query(None, description="Filter by industry"),
     min_lead_score: Optional[int] = Query(None, description="Minimum lead score"),
     max_lead_score: Optional[int] = Query(None, description="Maximum lead score"),
+    q: Optional[str] = Query(None, description="Full-text search over name, industry, summary and address"),
+    sort: Optional[Literal["created_at", "lead_score", "relevance"]] = Query(None, description="Sort key, descending (default: relevance with q, else created_at)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    view: Literal["full", "preview"] = Query("full", description="preview: id, name, industry, score, country, email, website"),
+    fields: Optional[str] = Query(None, description="Comma-separated lead fields to return instead of a view (id is always included)"),
+    session: AsyncSession = Depends(get_session),
+    user: Principal = Depends(get_current_principal),  # only logged-in users
+):
+    service = LeadService(session)
+    leads, next_cursor = await service.list_leads(
+        user_id=user.id,  # filter only leads for this user
+        industry=industry,
+        min_lead_score=min_lead_score,
+        max_lead_score=max_lead_score,
+        q=q,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        fields=resolve_fields(view, _split_fields(fields)),
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return LeadJSONResponse(leads, headers=headers)
+
+# List one page of leads plus the total matching count in a single round-trip
+@router.get("/page", response_model=LeadPage)
+async def list_leads_page(
+    industry: Optional[str] = Query(None, description="Filter by industry"),
+    min_lead_score: Optional[int] = Query(None, description="Minimum lead score"),
+    max_lead_score: Optional[int] = Query(None, description="Maximum lead score"),
+    q: Optional[str] = Query(None, description="Full-text search over name, industry, summary and address"),
+    sort: Optional[Literal["created_at", "lead_score", "relevance"]] = Query(None, description="Sort key, descending (default: relevance with q, else created_at)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    view: Literal["full", "preview"] = Query("full", description="preview: id, name, industry, score, country, email, website"),
+    fields: Optional[str] = Query(None, description="Comma-separated lead fields to return instead of a view (id is always included)"),
+    count_mode: Literal["exact", "estimated"] = Query("exact", description="estimated uses the planner's row estimate"),
     session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),  # only logged-in users
+    user: Principal = Depends(get_current_principal),  # only logged-in users
 ):
     service = LeadService(session)
-    leads = await service.list_leads(
+    page = await service.list_leads_with_total(
         user_id=user.id,  # filter only leads for this user
         industry=industry,
         min_lead_score=min_lead_score,
-        max_lead_score=max_lead_score
+        max_lead_score=max_lead_score,
+        q=q,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        count_mode=count_mode,
+        fields=resolve_fields(view, _split_fields(fields)),
     )
-    return [LeadRead.model_validate(l) for l in leads]
+    return LeadJSONResponse(page)
 
 # Get leads count
 @router.get("/count")
@@ -41,24 +118,91 @@ async def get_leads_count(
     industry: Optional[str] = Query(None, description="Filter by industry"),
     min_lead_score: Optional[int] = Query(None, description="Minimum lead score"),
     max_lead_score: Optional[int] = Query(None, description="Maximum lead score"),
+    q: Optional[str] = Query(None, description="Full-text search over name, industry, summary and address"),
+    count_mode: Literal["exact", "estimated"] = Query("exact", description="estimated uses the planner's row estimate"),
     session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),  # only logged-in users
+    user: Principal = Depends(get_current_principal),  # only logged-in users
 ):
     service = LeadService(session)
     count = await service.count_leads(
         user_id=user.id,  # filter only leads for this user
         industry=industry,
         min_lead_score=min_lead_score,
-        max_lead_score=max_lead_score
+        max_lead_score=max_lead_score,
+        q=q,
+        count_mode=count_mode,
     )
     return {"count": count}
 
+# Stream all matching leads as a CSV or NDJSON download
+@router.get("/export")
+async def export_leads_file(
+    format: Literal["csv", "ndjson"] = Query("csv", description="Download format"),
+    industry: Optional[str] = Query(None, description="Filter by industry"),
+    min_lead_score: Optional[int] = Query(None, description="Minimum lead score"),
+    max_lead_score: Optional[int] = Query(None, description="Maximum lead score"),
+    q: Optional[str] = Query(None, description="Full-text search over name, industry, summary and address"),
+    view: Literal["full", "preview"] = Query("full", description="preview: id, name, industry, score, country, email, website"),
+    fields: Optional[str] = Query(None, description="Comma-separated lead fields to return instead of a view (id is always included)"),
+    user: Principal = Depends(get_current_principal),
+):
+    columns = resolve_fields(view, _split_fields(fields))
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_leads(format, user.id, industry, min_lead_score, max_lead_score, q, columns),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="leads.{format}"'},
+    )
+
+# Dashboard aggregates (per-industry counts, score histogram, verified ratio)
+@router.get("/stats", response_model=LeadStatsRead)
+async def get_lead_stats(
+    session: AsyncSession = Depends(get_session),
+    user: Principal = Depends(get_current_principal),
+):
+    service = LeadService(session)
+    stats = await service.get_stats(user.id)
+    return LeadStatsRead.model_validate(stats)
+
+# Poll background enrichment (lead_score + summary) for chat-saved leads
+@router.get("/enrichment-status", response_model=LeadEnrichmentStatus)
+async def get_enrichment_status(
+    lead_ids: List[uuid.UUID] = Query(..., description="Lead IDs returned by /chat/"),
+    session: AsyncSession = Depends(get_session),
+    user: Principal = Depends(get_current_principal),
+):
+    service = LeadService(session)
+    status = await service.get_enrichment_status(user.id, lead_ids)
+    return LeadEnrichmentStatus.model_validate(status)
+
+# Update many leads at once (by ids and/or filter)
+@router.patch("/bulk", response_model=LeadBulkResult)
+async def bulk_update_leads(
+    data: LeadBulkUpdate,
+    session: AsyncSession = Depends(get_session),
+    user: Principal = Depends(get_current_principal),
+):
+    service = LeadService(session)
+    affected = await service.bulk_update(user.id, data.changes, ids=data.ids, lead_filter=data.filter)
+    return LeadBulkResult(affected=affected)
+
+# Delete many leads at once (by ids and/or filter)
+@router.delete("/bulk", response_model=LeadBulkResult)
+async def bulk_delete_leads(
+    data: LeadBulkDelete,
+    session: AsyncSession = Depends(get_session),
+    user: Principal = Depends(get_current_principal),
+):
+    service = LeadService(session)
+    affected = await service.bulk_delete(user.id, ids=data.ids, lead_filter=data.filter)
+    return LeadBulkResult(affected=affected)
+
 # Get lead by ID
 @router.get("/{lead_id}", response_model=LeadRead)
 async def get_lead(lead_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
     service = LeadService(session)
     lead_dict = await service.get_lead(lead_id)
-    return LeadRead.model_validate(lead_dict)
+    return LeadJSONResponse(lead_dict)
 
 # Update lead
 @router.put("/{lead_id}", response_model=LeadRead)
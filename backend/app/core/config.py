@@ -16,6 +16,35 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str
     GOOGLE_MAPS_API_KEY: str
+    GOOGLE_MAPS_TIMEOUT_SECONDS: float = 10.0
+    GOOGLE_MAPS_MAX_RETRIES: int = 2
+    GOOGLE_MAPS_MAX_CONNECTIONS: int = 20
+    GOOGLE_MAPS_DETAIL_CONCURRENCY: int = 5
+    GOOGLE_MAPS_DETAIL_DEADLINE_SECONDS: float = 5.0
+    GEOCODE_CACHE_MAX_ENTRIES: int = 1024
+    GEOCODE_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 30  # 30 days
+    GEOCODE_NEGATIVE_CACHE_TTL_SECONDS: int = 60 * 60  # locations Google can't resolve
+    PLACES_CACHE_MAX_ENTRIES: int = 512  # nearby-search results
+    PLACES_NEARBY_CACHE_TTL_SECONDS: int = 60 * 60  # 1 hour
+    PLACES_DETAILS_CACHE_MAX_ENTRIES: int = 10000
+    PLACES_DETAILS_CACHE_TTL_SECONDS: int = 60 * 60 * 24  # 1 day
+    CHAT_CONTEXT_BACKEND: str = "memory"  # "memory" or "database"
+    CHAT_CONTEXT_MAX_ENTRIES: int = 10000
+    CHAT_CONTEXT_TTL_SECONDS: int = 60 * 60 * 24  # 1 day
+    LEAD_ENRICHMENT_BATCH_SIZE: int = 10
+    LEAD_ENRICHMENT_WORKERS: int = 2
+    LEAD_ENRICHMENT_BACKEND: str = "inprocess"  # "inprocess" or "external"
+    LEAD_ENRICHMENT_CLAIM_TIMEOUT_SECONDS: int = 5 * 60  # re-queue "processing" leads after this
+    LEAD_ENRICHMENT_POLL_INTERVAL_SECONDS: float = 30.0  # in-process sweep for pending/stale leads
+    LEAD_ENRICHMENT_MAX_ATTEMPTS: int = 3  # failed Gemini calls before a lead is marked failed
+    LEAD_ENRICHMENT_RETRY_DELAY_SECONDS: int = 60  # x attempts so far before the next retry
+    PASSWORD_HASH_WORKERS: int = 2
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    AUTHZ_VERSION_CACHE_TTL_SECONDS: int = 30
+    JWT_CACHE_MAX_ENTRIES: int = 4096
+    AUTHORIZATION_MATRIX_TTL_SECONDS: int = 60
+    LEAD_ENRICHMENT_MAX_AGE_SECONDS: int = 60 * 60 * 24 * 30  # re-score saved leads after 30 days
 
     model_config = SettingsConfigDict(
         env_file=".env",
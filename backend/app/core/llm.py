@@ -0,0 +1,13 @@
+from functools import lru_cache
+from langchain_google_genai import ChatGoogleGenerativeAI
+from app.core.config import get_settings
+
+
+@lru_cache()
+def get_llm() -> ChatGoogleGenerativeAI:
+    """Shared Gemini chat model used by the chat pipeline and background workers"""
+    settings = get_settings()
+    return ChatGoogleGenerativeAI(
+        model=settings.GEMINI_MODEL,
+        google_api_key=settings.GEMINI_API_KEY,
+    )
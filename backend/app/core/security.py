@@ -1,8 +1,33 @@
 # app/core/security.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
+from app.core.config import get_settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Hashing runs in worker processes: depending on the installed backend,
+# passlib's bcrypt may hold the GIL, so threads would still stall the event
+# loop. The pool size caps how many cores a burst of logins can take.
+_hash_executor: ProcessPoolExecutor | None = None
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=get_settings().PASSWORD_HASH_WORKERS,
+            # spawn, not fork: the server process has threads and open sockets
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+def shutdown_password_pool() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
 def hash_password(password: str) -> str:
     """Hash a plain password"""
     return pwd_context.hash(password)
@@ -10,3 +35,11 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     """Verify a plain password against its hash"""
     return pwd_context.verify(password, password_hash)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the password worker pool; use this from async code"""
+    return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), hash_password, password)
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """verify_password on the password worker pool; use this from async code"""
+    return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), verify_password, password, password_hash)
@@ -3,4 +3,7 @@ from app.models.users import User
 from app.models.timestamp import TimestampMixin
 from app.models.refresh_token import RefreshToken
 from app.models.lead import Lead
-from app.models.blog import Blog
\ No newline at end of file
+from app.models.blog import Blog
+from app.models.geocode_cache import GeocodeCacheEntry
+from app.models.chat_context import ChatContext
+from app.models.lead_stats import LeadStat
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from sqlalchemy import delete, select
+from app.db.session import async_session
+
+
+class ExpiredRowPruner:
+    """Deletes rows whose expiry column is in the past, for tables used as
+    caches (chat_contexts, geocode_cache).
+
+    maybe_prune() is called from the cache's write path. At most once per
+    interval (or on the next write while a backlog remains) it starts a
+    background task that deletes one batch of expired rows. The caller
+    never waits on it, and errors are only logged.
+    """
+
+    def __init__(self, key_column, expires_column, interval_seconds: float = 5 * 60, batch_size: int = 1000):
+        self.key_column = key_column
+        self.expires_column = expires_column
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self._next_run = 0.0
+        self._task: asyncio.Task | None = None
+
+    def maybe_prune(self) -> None:
+        if time.monotonic() < self._next_run or (self._task and not self._task.done()):
+            return
+        self._next_run = time.monotonic() + self.interval
+        self._task = asyncio.create_task(self.prune())
+
+    async def prune(self) -> int:
+        """Delete one batch of expired rows; returns how many were deleted"""
+        expired = (
+            select(self.key_column)
+            .where(self.expires_column < datetime.now(timezone.utc))
+            .limit(self.batch_size)
+        )
+        try:
+            async with async_session() as session:
+                result = await session.exec(delete(self.key_column.table).where(self.key_column.in_(expired)))
+                await session.commit()
+        except Exception as e:
+            print(f"⚠️ Pruning {self.key_column.table.name} failed:", e)
+            return 0
+        if result.rowcount >= self.batch_size:
+            # Backlog left: the next write starts another batch right away
+            self._next_run = 0.0
+        return result.rowcount
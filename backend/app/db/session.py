@@ -14,6 +14,9 @@ engine = create_async_engine(
     max_overflow = 20,
 )
 
+# Also used directly by code that outlives a request: background workers and
+# streaming response bodies, which run after request-scoped dependencies such
+# as get_session() have already been closed.
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -7,7 +7,8 @@ from uuid import UUID
 from app.models.authorization import Role, Permission
 from app.models.users import User
 from app.db.session import get_session
-from app.utils.jwt import verify_token
+from app.utils.jwt import verify_token, decode_access_token
+from app.services.principal_cache import Principal, get_principal_cache
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
@@ -98,6 +99,66 @@ async def get_current_user(
 
     return user
 
+# --------------------------
+# Cached principal dependencies
+# --------------------------
+def _token_from_request(request: Request) -> str | None:
+    """Bearer token from the Authorization header, else the access_token cookie"""
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ", 1)[1]
+    return request.cookies.get("access_token")
+
+
+async def _resolve_principal(session: AsyncSession, token: str) -> Principal | None:
+    """Permissions embedded in the token when they are still current,
+    else the cached (or freshly loaded) principal."""
+    claims = decode_access_token(token)
+    cache = get_principal_cache()
+    principal = await cache.from_claims(session, claims)
+    if principal is None:
+        principal = await cache.get(session, claims["sub"])
+    return principal
+
+
+async def get_current_principal(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> Principal:
+    """
+    Lightweight get_current_user for hot endpoints: returns the caller's
+    id, active flag and permissions from the principal cache, so a cache hit
+    needs no database query. Inactive users are rejected.
+    """
+    token = _token_from_request(request)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    principal = await _resolve_principal(session, token)
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+
+    return principal
+
+
+async def get_principal_or_none(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> Principal | None:
+    """
+    Cached principal if logged in (and active), else None (guest).
+    """
+    token = _token_from_request(request)
+    if not token:
+        return None  # guest
+
+    principal = await _resolve_principal(session, token)
+    if not principal or not principal.is_active:
+        return None
+    return principal
+
 # --------------------------
 # Permission check dependency
 # --------------------------
@@ -107,18 +168,12 @@ def require_permission(module: str, action: str):
     Example: require_permission("user", "create")
     """
 
-    async def dependency(current_user: User = Depends(get_current_user)):
-        # Build the full permission code: e.g. "user:create"
-        required_code = f"{module}:{action}"
-
-        # roles and permissions are already loaded on current_user
-        user_permissions = {
-            f"{perm.module}:{perm.name}"
-            for role in current_user.roles
-            for perm in role.permissions
-        }
+    # Build the full permission code: e.g. "user:create"
+    required_code = f"{module}:{action}"
 
-        if required_code not in user_permissions:
+    async def dependency(principal: Principal = Depends(get_current_principal)):
+        # single AND of the principal's mask with the permission's bit
+        if not principal.has_permission(required_code):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Missing permission: {required_code}",
@@ -12,6 +12,9 @@ from app.api.v1.chat import router as chat_router
 from app.api.v1.lead import router as lead_router
 from app.api.v1.blog import router as blog_router
 from app.api.v1.oauth import router as oauth_router
+from app.services.maps_service import close_maps_client
+from app.core.security import shutdown_password_pool
+from app.services.enrichment_service import get_enrichment_queue
 from fastapi.staticfiles import StaticFiles
 
 # @asynccontextmanager
@@ -28,7 +31,18 @@ from fastapi.staticfiles import StaticFiles
 #     yield
 
 # app = FastAPI(title="RBAC App", lifespan=lifespan)
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    enrichment_queue = get_enrichment_queue()
+    await enrichment_queue.start()
+    yield
+    await enrichment_queue.stop()
+    # Release pooled connections held by shared HTTP clients
+    await close_maps_client()
+    shutdown_password_pool()
+
+app = FastAPI(lifespan=lifespan)
 
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -38,6 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(authentication_router)
@@ -7,7 +7,8 @@ from datetime import datetime, timezone
 if TYPE_CHECKING:
     from app.models.users import User
 
-# Role hierarchy
+# Role hierarchy: a role inherits the permissions of every lower-level role
+# (compiled into the AuthorizationMatrix)
 ROLE_HIERARCHY = {
     "superadmin": 3,
     "admin": 2,
@@ -0,0 +1,12 @@
+from sqlmodel import SQLModel, Field, Column, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+
+class ChatContext(SQLModel, table=True):
+    __tablename__ = "chat_contexts"
+
+    # "user:<uuid>" or "guest:<session id>"
+    key: str = Field(sa_column=Column(String, primary_key=True))
+    context: dict = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False))
+    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False, index=True))
@@ -0,0 +1,14 @@
+from sqlmodel import SQLModel, Field, Column, String, Float, DateTime
+from datetime import datetime
+
+
+class GeocodeCacheEntry(SQLModel, table=True):
+    __tablename__ = "geocode_cache"
+
+    # Normalized location string, e.g. "new york"
+    query: str = Field(sa_column=Column(String, primary_key=True))
+    # Both NULL for a location Google could not resolve (kept for a shorter TTL)
+    lat: float | None = Field(default=None, sa_column=Column(Float, nullable=True))
+    lng: float | None = Field(default=None, sa_column=Column(Float, nullable=True))
+    formatted_address: str | None = Field(default=None, sa_column=Column(String, nullable=True))
+    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False, index=True))
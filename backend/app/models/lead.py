@@ -1,14 +1,34 @@
+import hashlib
+import re
 import uuid
 from sqlmodel import SQLModel, Field, Column, String, Integer, Boolean, Relationship, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.timestamp import TimestampMixin
 from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING 
-from sqlalchemy import ForeignKey 
+from sqlalchemy import ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 if TYPE_CHECKING:
     from app.models.users import User
-    
+
+# Lead enrichment (lead_score + summary) states
+ENRICHMENT_PENDING = "pending"
+ENRICHMENT_PROCESSING = "processing"
+ENRICHMENT_DONE = "done"
+ENRICHMENT_FAILED = "failed"
+
+
+def lead_identity_hash(place_id: str | None, business_name: str | None, address: str | None) -> str:
+    """Stable identity of a discovered business: its Google place_id, or the
+    normalized name + address when there is none."""
+    if place_id:
+        identity = f"place:{place_id}"
+    else:
+        normalize = lambda value: re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (value or "").lower())).strip()
+        identity = f"name:{normalize(business_name)}|{normalize(address)}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
 class Lead(SQLModel, table=True):
     __tablename__ = "leads"
 
@@ -37,6 +57,18 @@ class Lead(SQLModel, table=True):
     country: str | None = Field(default=None, sa_column=Column(String, nullable=True))
     website: str | None = Field(default=None, sa_column=Column(String, nullable=True))
     summary: str | None = Field(default=None, sa_column=Column(String, nullable=True))
+    # External identity of chat-discovered leads, unique per user (see lead_identity_hash)
+    place_id: str | None = Field(default=None, sa_column=Column(String, nullable=True))
+    identity_hash: str | None = Field(default=None, sa_column=Column(String(64), nullable=True))
+    enrichment_status: str = Field(
+        default=ENRICHMENT_DONE,
+        sa_column=Column(String(20), nullable=False, default=ENRICHMENT_DONE, server_default=ENRICHMENT_DONE, index=True),
+    )
+    enriched_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    # When a worker claimed the lead (status "processing"); stale claims are picked up again
+    enrichment_claimed_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    # Failed Gemini calls for the current enrichment; retried with backoff until LEAD_ENRICHMENT_MAX_ATTEMPTS
+    enrichment_attempts: int = Field(default=0, sa_column=Column(Integer, nullable=False, default=0, server_default="0"))
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True), nullable=False)
@@ -47,3 +79,43 @@ class Lead(SQLModel, table=True):
     )
 
     user: Optional["User"] = Relationship(back_populates="leads")
+
+
+def new_lead(**fields) -> Lead:
+    """Build a Lead with its identity_hash filled in. Every path that creates
+    leads goes through this, so chat results upsert onto leads that were
+    entered or imported by hand."""
+    fields.setdefault("identity_hash", lead_identity_hash(
+        fields.get("place_id"), fields.get("business_name"), fields.get("address"),
+    ))
+    return Lead(**fields)
+
+
+# Full-text search document, weighted name > industry > summary > address.
+# Generated by Postgres and kept off the SQLModel fields so it never shows up
+# in model_dump()/API responses; query it through LEAD_SEARCH_VECTOR.
+LEAD_SEARCH_CONFIG = "english"
+LEAD_SEARCH_VECTOR = Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        "setweight(to_tsvector('english', coalesce(business_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(industry, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(summary, '')), 'C') || "
+        "setweight(to_tsvector('english', coalesce(address, '')), 'D')",
+        persisted=True,
+    ),
+)
+Lead.__table__.append_column(LEAD_SEARCH_VECTOR)
+
+Index("ix_leads_search_vector", LEAD_SEARCH_VECTOR, postgresql_using="gin")
+# Trigram indexes so substring (ILIKE '%...%') filters don't scan the table
+Index("ix_leads_industry_trgm", Lead.__table__.c.industry, postgresql_using="gin", postgresql_ops={"industry": "gin_trgm_ops"})
+Index("ix_leads_business_name_trgm", Lead.__table__.c.business_name, postgresql_using="gin", postgresql_ops={"business_name": "gin_trgm_ops"})
+# Every lead query is scoped by user_id; these match the list/count/search
+# access patterns (id trails created_at/lead_score for keyset pagination)
+Index("ix_leads_user_id_created_at", Lead.__table__.c.user_id, Lead.__table__.c.created_at, Lead.__table__.c.id)
+Index("ix_leads_user_id_lead_score", Lead.__table__.c.user_id, Lead.__table__.c.lead_score, Lead.__table__.c.id)
+Index("ix_leads_user_id_industry", Lead.__table__.c.user_id, Lead.__table__.c.industry)
+# Conflict target for the chat-lead upsert; manual leads (NULL hash) never collide
+Index("ix_leads_user_id_identity_hash", Lead.__table__.c.user_id, Lead.__table__.c.identity_hash, unique=True)
@@ -0,0 +1,29 @@
+import uuid
+from sqlmodel import SQLModel, Field, Column, String, Integer
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+# Lead scores are bucketed into SCORE_BUCKETS ranges of SCORE_BUCKET_WIDTH
+# (0-9, 10-19, ..., 90-100); the last bucket also holds 100.
+SCORE_BUCKET_WIDTH = 10
+SCORE_BUCKETS = 10
+
+
+def score_bucket(lead_score: int) -> int:
+    return min(max(lead_score, 0) // SCORE_BUCKET_WIDTH, SCORE_BUCKETS - 1)
+
+
+class LeadStat(SQLModel, table=True):
+    """Per-user lead counts by (industry, score bucket), kept in step with
+    the leads table by LeadStatsService so dashboard aggregates never scan
+    the user's leads."""
+
+    __tablename__ = "lead_stats"
+
+    user_id: uuid.UUID = Field(
+        sa_column=Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    )
+    industry: str = Field(sa_column=Column(String, primary_key=True))
+    score_bucket: int = Field(sa_column=Column(Integer, primary_key=True))
+    total: int = Field(default=0, sa_column=Column(Integer, nullable=False, default=0))
+    verified: int = Field(default=0, sa_column=Column(Integer, nullable=False, default=0))
@@ -1,5 +1,5 @@
 from app.models.timestamp import TimestampMixin
-from sqlmodel import SQLModel, Field, Column, String, Boolean, Relationship
+from sqlmodel import SQLModel, Field, Column, String, Boolean, Integer, Relationship
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.authorization import Role, UserRole
@@ -19,6 +19,9 @@ class User(SQLModel, TimestampMixin, table=True):
     is_active: bool = Field(default=True, sa_column=Column(Boolean, nullable=False, default=True))
     google_sub: Optional[str] = Field(default=None, sa_column=Column(String, unique=True, index=True))
     profile_pic: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
+    # Bumped whenever the user's grants change; access tokens carrying an
+    # older version fall back to loading permissions from the database
+    authz_version: int = Field(default=1, sa_column=Column(Integer, nullable=False, default=1, server_default="1"))
 
     # Multi-role support
     roles: List[Role] = Relationship(back_populates="users", link_model=UserRole)
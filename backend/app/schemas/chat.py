@@ -2,4 +2,6 @@ from pydantic import BaseModel
 from typing import Optional
 
 class ChatRequest(BaseModel):
-    message: Optional[str] = None
\ No newline at end of file
+    message: Optional[str] = None
+    refresh: bool = False  # bypass cached Places results
+    session_id: Optional[str] = None  # guest session, if the client doesn't keep cookies
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional
+from typing import Optional, Union
 import uuid
 from sqlmodel import SQLModel, Field
 from datetime import datetime
@@ -14,6 +14,12 @@ class LeadPreview(BaseModel):
 
 
 
+class LeadPreviewRead(LeadPreview):
+    # view=preview rows of GET /leads/
+    id: uuid.UUID
+    lead_score: int
+
+
 class LeadResponse(LeadPreview):
     id: uuid.UUID
     verified: bool
@@ -32,6 +38,7 @@ class LeadBase(SQLModel):
     country: Optional[str] = None
     website: Optional[str] = None
     summary: Optional[str] = None
+    place_id: Optional[str] = None
 
 
 class LeadCreate(LeadBase):
@@ -53,5 +60,84 @@ class LeadUpdate(SQLModel):
 
 class LeadRead(LeadBase):
     id: uuid.UUID
+    enrichment_status: str = "done"
     created_at: datetime
     updated_at: datetime
+
+
+class LeadEnrichmentState(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: uuid.UUID
+    enrichment_status: str
+    lead_score: int
+    summary: Optional[str] = None
+
+
+class LeadEnrichmentStatus(BaseModel):
+    pending: int
+    processing: int = 0
+    done: int
+    failed: int
+    leads: list[LeadEnrichmentState]
+
+
+class LeadPage(BaseModel):
+    items: list[Union[LeadRead, LeadPreviewRead]]
+    total: int
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+class IndustryStats(BaseModel):
+    industry: str
+    total: int
+    verified: int
+    verified_ratio: float
+
+
+class ScoreBucket(BaseModel):
+    min_score: int
+    max_score: int
+    count: int
+
+
+class LeadStatsRead(BaseModel):
+    total: int
+    verified: int
+    verified_ratio: float
+    industries: list[IndustryStats]
+    score_histogram: list[ScoreBucket]
+
+
+class LeadImportError(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class LeadImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[LeadImportError]
+    errors_truncated: bool = False
+
+
+class LeadFilter(BaseModel):
+    industry: Optional[str] = None
+    min_lead_score: Optional[int] = None
+    max_lead_score: Optional[int] = None
+    q: Optional[str] = None
+
+
+class LeadBulkDelete(BaseModel):
+    # Target leads by id, by filter, or both (must match both)
+    ids: Optional[list[uuid.UUID]] = None
+    filter: Optional[LeadFilter] = None
+
+
+class LeadBulkUpdate(LeadBulkDelete):
+    changes: LeadUpdate
+
+
+class LeadBulkResult(BaseModel):
+    affected: int
@@ -5,7 +5,7 @@ from sqlalchemy.orm import selectinload
 
 from app.models.authorization import Role, Permission
 from app.models.users import User
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 
 
 async def seed_roles_permissions(db: AsyncSession):
@@ -79,7 +79,7 @@ async def seed_default_superadmin(
     user = User(
         username=username,
         email=email,
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
         is_active=True,
     )
 
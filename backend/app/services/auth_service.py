@@ -5,8 +5,9 @@ from datetime import datetime, timedelta, timezone
 from app.models.users import User
 from app.models.authorization import Role
 from app.models.refresh_token import RefreshToken
-from app.core.security import hash_password, verify_password
-from app.utils.jwt import create_refresh_token
+from app.core.security import hash_password_async, verify_password_async
+from app.utils.jwt import create_access_token, create_refresh_token
+from app.services.principal_cache import get_principal_cache
 from app.schemas.users import UserRead
 from sqlalchemy.orm import selectinload
 
@@ -49,7 +50,7 @@ class AuthService:
         user = User(
             username=username,
             email=email,
-            password_hash=hash_password(password) if password else None,
+            password_hash=await hash_password_async(password) if password else None,
             profile_pic=profile_pic,
             google_sub=google_sub,
             roles=[default_role],
@@ -83,11 +84,23 @@ class AuthService:
         if not user or not user.password_hash:
             return None
 
-        if verify_password(password, user.password_hash):
+        if await verify_password_async(password, user.password_hash):
             return user
         
         return None
 
+    async def issue_access_token(self, user_id) -> str:
+        """Access token with the user's permissions embedded (see create_access_token)"""
+        principal = await get_principal_cache().get(self.session, user_id)
+        if principal is None:
+            return create_access_token(user_id)
+        return create_access_token(
+            user_id,
+            permissions=principal.permission_mask,
+            authz_version=principal.authz_version,
+            catalog=principal.matrix.fingerprint,
+        )
+
     async def create_and_store_refresh_token(
         self, user: User, revoke_old: bool = False
     ) -> str:
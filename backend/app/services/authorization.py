@@ -2,9 +2,17 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import selectinload
 from app.models.authorization import Role, Permission
+from app.services.principal_cache import get_principal_cache, bump_role_authz_version
+from app.services.authorization_matrix import build_authorization_matrix
 import uuid
 from typing import List, Optional
 
+async def _grants_changed(session: AsyncSession) -> None:
+    """Recompile the authorization matrix and drop principals built from the old one"""
+    await build_authorization_matrix(session)
+    get_principal_cache().clear()
+
+
 class RoleService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -13,6 +21,7 @@ class RoleService:
         self.session.add(role)
         await self.session.commit()
         await self.session.refresh(role)
+        await _grants_changed(self.session)
         return role
 
     async def get_role(self, role_id: uuid.UUID) -> Optional[Role]:
@@ -33,14 +42,18 @@ class RoleService:
         self.session.add(role)
         await self.session.commit()
         await self.session.refresh(role)
+        # Role names key the matrix (and ROLE_HIERARCHY)
+        await _grants_changed(self.session)
         return role
 
     async def delete_role(self, role_id: uuid.UUID) -> bool:
         role = await self.session.get(Role, role_id)
         if not role:
             return False
+        await bump_role_authz_version(self.session, role_id)
         await self.session.delete(role)
         await self.session.commit()
+        await _grants_changed(self.session)
         return True
 
     async def assign_permissions(self, role_id: uuid.UUID, permission_ids: List[uuid.UUID]) -> Role:
@@ -53,7 +66,10 @@ class RoleService:
 
         role.permissions = permissions
         self.session.add(role)
+        await bump_role_authz_version(self.session, role_id)
         await self.session.commit()
+        # Any user holding this role may have gained or lost permissions
+        await _grants_changed(self.session)
         await self.session.refresh(role)
         return role
 
@@ -65,6 +81,8 @@ class PermissionService:
     async def create_permission(self, permission: Permission) -> Permission:
         self.session.add(permission)
         await self.session.commit()
+        # New codes shift mask bits; tokens with the old matrix fingerprint fall back to the DB
+        await _grants_changed(self.session)
         await self.session.refresh(permission)
         return permission
 
@@ -83,6 +101,7 @@ class PermissionService:
         permission.name = new_name
         self.session.add(permission)
         await self.session.commit()
+        await _grants_changed(self.session)
         await self.session.refresh(permission)
         return permission
 
@@ -92,4 +111,5 @@ class PermissionService:
             return False
         await self.session.delete(permission)
         await self.session.commit()
+        await _grants_changed(self.session)
         return True
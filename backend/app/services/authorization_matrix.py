@@ -0,0 +1,93 @@
+import hashlib
+import time
+from collections import defaultdict
+from typing import Iterable
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import get_settings
+from app.models.authorization import Permission, Role, RolePermission, ROLE_HIERARCHY
+
+settings = get_settings()
+
+
+class AuthorizationMatrix:
+    """Compiled role/permission grants.
+
+    Permission codes ("module:name") are interned to bit positions in sorted
+    order, and every role is compiled to a bitmask of its permissions plus,
+    for roles in ROLE_HIERARCHY, those of every lower-level role. A
+    permission check is then a single AND of two integers.
+
+    The fingerprint identifies the compiled grants; a mask is only
+    meaningful to a matrix with the same fingerprint.
+    """
+
+    def __init__(self, codes: Iterable[str], role_permissions: dict[str, set[str]]):
+        self.codes = tuple(sorted(set(codes)))
+        self._bits = {code: 1 << i for i, code in enumerate(self.codes)}
+
+        own = {role: self.mask(perms) for role, perms in role_permissions.items()}
+        self.role_masks = {}
+        for role, mask in own.items():
+            level = ROLE_HIERARCHY.get(role)
+            if level is not None:
+                for lower, lower_level in ROLE_HIERARCHY.items():
+                    if lower_level < level:
+                        mask |= own.get(lower, 0)
+            self.role_masks[role] = mask
+
+        compiled = "\n".join(self.codes) + "\n" + "\n".join(f"{r}={m:x}" for r, m in sorted(self.role_masks.items()))
+        self.fingerprint = hashlib.sha256(compiled.encode()).hexdigest()[:12]
+
+    def bit(self, code: str) -> int:
+        """Mask of a single permission (0 if it does not exist)"""
+        return self._bits.get(code, 0)
+
+    def mask(self, codes: Iterable[str]) -> int:
+        mask = 0
+        for code in codes:
+            mask |= self._bits.get(code, 0)
+        return mask
+
+    def role_mask(self, roles: Iterable[str]) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self.role_masks.get(role, 0)
+        return mask
+
+    def codes_for(self, mask: int) -> frozenset[str]:
+        return frozenset(code for code, bit in self._bits.items() if mask & bit)
+
+
+_matrix: AuthorizationMatrix | None = None
+_built_at = 0.0
+
+
+async def build_authorization_matrix(session: AsyncSession) -> AuthorizationMatrix:
+    """Compile the matrix from the roles/permissions tables and make it current"""
+    global _matrix, _built_at
+    codes = (await session.exec(select(Permission.module, Permission.name))).all()
+    grants = (await session.exec(
+        select(Role.name, Permission.module, Permission.name)
+        .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+        .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+    )).all()
+
+    role_permissions: dict[str, set[str]] = defaultdict(set)
+    for role, module, name in grants:
+        perms = role_permissions[role]  # roles without permissions still get a (zero) mask
+        if name is not None:
+            perms.add(f"{module}:{name}")
+
+    _matrix = AuthorizationMatrix((f"{module}:{name}" for module, name in codes), role_permissions)
+    _built_at = time.monotonic()
+    return _matrix
+
+
+async def get_authorization_matrix(session: AsyncSession) -> AuthorizationMatrix:
+    """Process-wide matrix. RoleService/PermissionService rebuild it on
+    writes in this process; other workers pick changes up once it is older
+    than AUTHORIZATION_MATRIX_TTL_SECONDS."""
+    if _matrix is None or time.monotonic() - _built_at > settings.AUTHORIZATION_MATRIX_TTL_SECONDS:
+        return await build_authorization_matrix(session)
+    return _matrix
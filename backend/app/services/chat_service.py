@@ -1,21 +1,30 @@
+import asyncio
 import json
-import re
-import googlemaps
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, case, literal_column
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel.ext.asyncio.session import AsyncSession
 from langchain.prompts import PromptTemplate
 from langchain.schema import HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from app.core.config import get_settings
+from app.db.session import async_session
 from app.schemas.lead import LeadCreate
-from app.models.lead import Lead
-from app.models.users import User  # assuming you have a User model
+from app.models.lead import Lead, new_lead, ENRICHMENT_PENDING, ENRICHMENT_PROCESSING, ENRICHMENT_DONE
+from app.services.principal_cache import Principal
+from app.services.maps_service import get_maps_client, MapsAPIError
+from app.services.geocode_cache import get_geocode_cache
+from app.services.places_cache import get_places_cache
+from app.services.enrichment_service import get_enrichment_queue
+from app.services.lead_stats_service import LeadStatsService, stats_key
+from app.services.intent_extractor import fast_extract, record_llm_fallback
+from app.services.context_store import get_context_store
 
 # -----------------------
 # Settings & Globals
 # -----------------------
 settings = get_settings()
-gmaps = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY)
-user_context = {}  # In-memory chat memory (per user)
 
 # -----------------------
 # Prompt for extraction
@@ -36,39 +45,110 @@ Query: {query}
 # -----------------------
 # Google Places API helper
 # -----------------------
-def get_leads(industry: str, location: str, radius: int = 5000, limit: int | None = 5):
-    """Fetch leads from Google Places API.
-    - limit=None → return all available leads (logged-in user)
-    - limit=5 → return only 5 leads (guest)
-    """
-    geocode = gmaps.geocode(location)
-    if not geocode:
-        return []
+# The only Place Details fields _build_lead reads; all that is requested and cached
+PLACE_DETAILS_FIELDS = ("website", "formatted_phone_number")
 
-    latlng = geocode[0]["geometry"]["location"]
-    results = gmaps.places_nearby(
-        location=latlng,
-        radius=radius,
-        keyword=industry,
-    )
+
+def _build_lead(place: dict, details: dict, industry: str) -> dict:
+    return {
+        "business_name": place.get("name"),
+        "place_id": place.get("place_id"),
+        "industry": industry,
+        "address": place.get("vicinity"),
+        "website": details.get("website", "N/A"),
+        "contact_number": details.get("formatted_phone_number", "N/A"),
+    }
+
+
+async def _fetch_place_details(place_id: str, semaphore: asyncio.Semaphore, refresh: bool = False) -> dict:
+    places_cache = get_places_cache()
+    if not refresh:
+        details = places_cache.get_details(place_id)
+        if details is not None:
+            return details
+
+    async with semaphore:
+        details = (await get_maps_client().place(place_id=place_id, fields=PLACE_DETAILS_FIELDS)).get("result", {})
+    places_cache.set_details(place_id, details)
+    return details
+
+
+async def _ranked_place_details(rank: int, place: dict, semaphore: asyncio.Semaphore, refresh: bool) -> tuple[int, dict | None]:
+    try:
+        return rank, await _fetch_place_details(place.get("place_id"), semaphore, refresh)
+    except Exception as e:
+        print("⚠️ Place details failed, dropping:", place.get("name"), e)
+        return rank, None
+
+
+async def _nearby_places(industry: str, location: str, radius: int, refresh: bool) -> list:
+    places_cache = get_places_cache()
+    places = None if refresh else places_cache.get_nearby(industry, location, radius)
+    if places is not None:
+        return places
+
+    try:
+        latlng = await get_geocode_cache().geocode(location)
+        if not latlng:
+            return []
+
+        results = await get_maps_client().places_nearby(
+            location=latlng,
+            radius=radius,
+            keyword=industry,
+        )
+    except MapsAPIError as e:
+        print("⚠️ Google Maps lookup failed:", e)
+        return []
 
     places = results.get("results", [])
+    places_cache.set_nearby(industry, location, radius, places)
+    return places
+
+
+async def iter_leads(industry: str, location: str, radius: int = 5000, limit: int | None = 5, refresh: bool = False):
+    """Yield (rank, lead) pairs as soon as each place's details arrive.
+
+    rank is the position in the places_nearby results. Place details are
+    looked up concurrently (bounded by GOOGLE_MAPS_DETAIL_CONCURRENCY). Any
+    lookup that fails or is still running at
+    GOOGLE_MAPS_DETAIL_DEADLINE_SECONDS drops only that lead.
+    """
+    places = await _nearby_places(industry, location, radius, refresh)
     if limit:
         places = places[:limit]
+    if not places:
+        return
+
+    semaphore = asyncio.Semaphore(settings.GOOGLE_MAPS_DETAIL_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_ranked_place_details(rank, place, semaphore, refresh))
+        for rank, place in enumerate(places)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=settings.GOOGLE_MAPS_DETAIL_DEADLINE_SECONDS):
+            rank, details = await next_done
+            if details is not None:
+                yield rank, _build_lead(places[rank], details, industry)
+    except asyncio.TimeoutError:
+        dropped = sum(1 for task in tasks if not task.done())
+        print(f"⏱️ Place details deadline reached, dropping {dropped} lead(s)")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def get_leads(industry: str, location: str, radius: int = 5000, limit: int | None = 5, refresh: bool = False):
+    """Fetch leads from Google Places API.
+    - limit=None → return all available leads (logged-in user)
+    - limit=5 → return only 5 leads (guest)
+    - refresh=True → bypass the Places cache and re-fetch from Google
 
-    leads = []
-    for place in places:
-        place_id = place.get("place_id")
-        details = gmaps.place(place_id=place_id).get("result", {})
-
-        leads.append({
-            "business_name": place.get("name"),
-            "industry": industry,
-            "address": place.get("vicinity"),
-            "website": details.get("website", "N/A"),
-            "contact_number": details.get("formatted_phone_number", "N/A"),
-        })
-    return leads
+    Leads keep the ranking order returned by places_nearby; see iter_leads
+    for the concurrency and deadline rules.
+    """
+    ranked = [item async for item in iter_leads(industry, location, radius, limit, refresh)]
+    return [lead for _, lead in sorted(ranked, key=lambda item: item[0])]
 
 # -----------------------
 # LLM extraction
@@ -91,63 +171,11 @@ async def run_extraction(message: str, llm: ChatGoogleGenerativeAI):
 
     return extraction_result
 
-# -----------------------
-# Lead Scoring & Summary
-# -----------------------
-async def score_and_summarize_lead(lead: dict, llm: ChatGoogleGenerativeAI) -> dict:
-    """Ask Gemini to score and summarize a lead"""
-    prompt = f"""
-        You are evaluating a business lead.
-        Lead info: {json.dumps(lead)}
-
-        Return JSON with:
-        - lead_score (1-100, based on business relevance, info completeness, and credibility)
-        - summary (1-2 sentence warm summary of the business)
-
-        Important instructions:
-        1. Output must be strictly valid JSON parsable by Python's json.loads().
-        2. Escape any double quotes inside string values as \\".
-        3. Use only JSON-safe characters; do not include extra symbols that would break JSON.
-        4. Do not include markdown, code fences, or extra text outside JSON.
-        5. Do not add commentary or explanations.
-        6. Use only simple words and phrases without apostrophes.
-
-        Example:
-        {{"lead_score": 85, "summary": "A popular restaurant in New York with strong reviews and online presence."}}
-        """
-
-    human_message = HumanMessage(content=prompt)
-    response = await llm.agenerate([[human_message]])
-    result_text = response.generations[0][0].text.strip()
-
-    # Clean up Gemini output
-    if result_text.startswith("```json"):
-        result_text = result_text[len("```json"):].strip()
-    if result_text.startswith("```"):
-        result_text = result_text[3:].strip()
-    if result_text.endswith("```"):
-        result_text = result_text[:-3].strip()
-
-    match = re.search(r"\{.*\}", result_text, re.DOTALL)
-    if match:
-        result_text = match.group(0)
-
-    try:
-        parsed = json.loads(result_text)
-        return {
-            "lead_score": int(parsed.get("lead_score", 0)),
-            "summary": parsed.get("summary", "No summary available.")
-        }
-    except Exception as e:
-        print("⚠️ Failed to parse Gemini output:", result_text, e)
-        return {"lead_score": 0, "summary": "No summary available."}
-
 # -----------------------
 # Human-like response helper
 # -----------------------
-async def generate_human_response(user_message: str, context: dict, leads: list, llm: ChatGoogleGenerativeAI):
-    """Generate a concise, human-like response using Gemini/LLM"""
-    prompt = f"""
+def _human_response_prompt(user_message: str, context: dict, leads: list) -> str:
+    return f"""
 You are a friendly assistant helping the user find industry.
 Keep replies short (1-3 sentences), natural, and avoid repeating greetings like "hello there".
 Give warm reply that is easy to understand and be direct and concise like talking to friend.
@@ -164,59 +192,138 @@ Special rules:
 Respond warmly and conversationally, but concise.
 If the user goes off-topic, gently redirect them back to finding leads.
 """
-    human_message = HumanMessage(content=prompt)
+
+
+async def generate_human_response(user_message: str, context: dict, leads: list, llm: ChatGoogleGenerativeAI):
+    """Generate a concise, human-like response using Gemini/LLM"""
+    human_message = HumanMessage(content=_human_response_prompt(user_message, context, leads))
     response = await llm.agenerate([[human_message]])
     return response.generations[0][0].text.strip()
 
+
+async def stream_human_response(user_message: str, context: dict, leads: list, llm: ChatGoogleGenerativeAI):
+    """Same as generate_human_response, but yields text chunks as the LLM produces them"""
+    human_message = HumanMessage(content=_human_response_prompt(user_message, context, leads))
+    async for chunk in llm.astream([human_message]):
+        if chunk.content:
+            yield chunk.content
+
 # -----------------------
-# Save leads to DB (with enrichment)
+# Save leads to DB (enrichment runs in background)
 # -----------------------
-async def save_leads_to_db(leads: list, db: AsyncSession, llm: ChatGoogleGenerativeAI, user: User):
-    """Save leads with enrichment (scoring + summary) and link to user"""
+async def save_leads_to_db(leads: list, db: AsyncSession, user: Principal) -> list[uuid.UUID]:
+    """Save raw leads linked to the user and queue them for enrichment.
+    lead_score/summary are filled in later by the enrichment worker.
+
+    Leads are upserted on (user_id, identity_hash), so finding the same
+    business again refreshes its contact details instead of adding a
+    duplicate. Existing leads are only re-enriched once their score is older
+    than LEAD_ENRICHMENT_MAX_AGE_SECONDS (or their enrichment failed).
+    """
+    rows = {}
     for lead in leads:
-        enrichment = await score_and_summarize_lead(lead, llm)
-
         lead_data = LeadCreate.model_validate({
             "business_name": lead.get("business_name"),
             "industry": lead.get("industry"),
             "contact_number": lead.get("contact_number"),
             "address": lead.get("address"),
             "website": lead.get("website"),
-            "lead_score": enrichment.get("lead_score", 0),
-            "summary": enrichment.get("summary", ""),
+            "place_id": lead.get("place_id"),
+            "lead_score": 0,
             "verified": False,
             "user_id": user.id,  # ✅ attach logged-in user ID
         })
+        db_lead = new_lead(**lead_data.model_dump(), enrichment_status=ENRICHMENT_PENDING)
+        # One row per identity: a statement may not upsert the same row twice
+        rows.setdefault(db_lead.identity_hash, db_lead.model_dump())
+
+    if not rows:
+        return []
 
-        db_lead = Lead(**lead_data.model_dump())
-        db.add(db_lead)
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.LEAD_ENRICHMENT_MAX_AGE_SECONDS)
+    # Leads already being enriched keep their claim instead of being queued twice
+    fresh = or_(
+        and_(Lead.enrichment_status == ENRICHMENT_DONE, Lead.enriched_at >= stale_before),
+        Lead.enrichment_status == ENRICHMENT_PROCESSING,
+    )
+    stmt = insert(Lead).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Lead.user_id, Lead.identity_hash],
+        set_={
+            "business_name": stmt.excluded.business_name,
+            "place_id": stmt.excluded.place_id,
+            "address": stmt.excluded.address,
+            "website": stmt.excluded.website,
+            "contact_number": stmt.excluded.contact_number,
+            "updated_at": stmt.excluded.updated_at,
+            "enrichment_status": case((fresh, Lead.enrichment_status), else_=ENRICHMENT_PENDING),
+            # A re-queued lead gets a fresh set of retries
+            "enrichment_attempts": case((fresh, Lead.enrichment_attempts), else_=0),
+        },
+    ).returning(
+        Lead.id, Lead.user_id, Lead.industry, Lead.lead_score, Lead.verified, Lead.enrichment_status,
+        # xmax is 0 only for freshly inserted rows
+        literal_column("xmax = 0").label("inserted"),
+    )
+    result = await db.exec(stmt)
+    saved = result.all()
 
+    await LeadStatsService(db).record(added=[stats_key(row) for row in saved if row.inserted])
     await db.commit()
 
+    await get_enrichment_queue().enqueue([row.id for row in saved if row.enrichment_status == ENRICHMENT_PENDING])
+    return [row.id for row in saved]
+
 # -----------------------
 # Main chat function
 # -----------------------
-async def chat(message: str, db: AsyncSession, llm: ChatGoogleGenerativeAI, user: User | None = None):
-    """Chat pipeline with login-based lead limits and context memory"""
-    # Use per-user memory
-    user_key = str(user.id) if user else "guest"
-    context = user_context.get(user_key, {})
-
-    # 1. Extract intent (industry + location)
-    extraction_result = await run_extraction(message, llm)
-    try:
-        data = json.loads(extraction_result)
-    except json.JSONDecodeError:
-        warm_text = await generate_human_response(message, context, [], llm)
-        return {"message": warm_text}
+def context_key(user: Principal | None, session_id: str | None) -> str:
+    """Key for the chat context store: per user, or per browser session for guests"""
+    if user:
+        return f"user:{user.id}"
+    return f"guest:{session_id}"
+
+
+async def _update_context(message: str, llm: ChatGoogleGenerativeAI, key: str) -> tuple[dict, bool]:
+    """Extract industry/location from the message and merge them into the
+    stored context for `key`. Returns (context, extraction_ok)."""
+    store = get_context_store()
+    context = await store.get(key)
+
+    # 1. Extract intent (industry + location), trying the local fast path first
+    data = fast_extract(message)
+    if data is None:
+        record_llm_fallback()
+        extraction_result = await run_extraction(message, llm)
+        try:
+            data = json.loads(extraction_result)
+        except json.JSONDecodeError:
+            return context, False
 
     # 2. Merge extracted data into stored context
-    for key in ["industry", "location"]:
-        if key in data and data[key] is not None:
-            context[key] = data[key]
+    for field in ["industry", "location"]:
+        if field in data and data[field] is not None:
+            context[field] = data[field]
 
     # Save updated context
-    user_context[user_key] = context
+    await store.set(key, context)
+    return context, True
+
+
+def _lead_limit(user: Principal | None) -> int:
+    if user:
+        print("✅ [DEBUG] Logged in user detected → fetching all leads")
+        return 3
+    print("⚠️ [DEBUG] Guest user detected → fetching only 5 leads")
+    return 5
+
+
+async def chat(message: str, db: AsyncSession, llm: ChatGoogleGenerativeAI, user: Principal | None = None, refresh: bool = False, session_id: str | None = None):
+    """Chat pipeline with login-based lead limits and context memory"""
+    context, extracted = await _update_context(message, llm, context_key(user, session_id))
+    if not extracted:
+        warm_text = await generate_human_response(message, context, [], llm)
+        return {"message": warm_text}
 
     # 3. Ask if info missing
     if "industry" not in context or "location" not in context:
@@ -224,14 +331,8 @@ async def chat(message: str, db: AsyncSession, llm: ChatGoogleGenerativeAI, user
         return {"message": warm_text}
 
     # 4. Apply login rules for lead fetching
-    if user:  
-        print("✅ [DEBUG] Logged in user detected → fetching all leads")
-        lead_limit = 3
-    else:
-        print("⚠️ [DEBUG] Guest user detected → fetching only 5 leads")
-        lead_limit = 5
-
-    leads = get_leads(context["industry"], context["location"], limit=lead_limit)
+    lead_limit = _lead_limit(user)
+    leads = await get_leads(context["industry"], context["location"], limit=lead_limit, refresh=refresh)
 
     # Debug: check how many leads returned
     print(f"📊 [DEBUG] Leads fetched: {len(leads)}")
@@ -239,9 +340,10 @@ async def chat(message: str, db: AsyncSession, llm: ChatGoogleGenerativeAI, user
         print("📌 [DEBUG] First lead:", leads[0])
 
     # 5. Save leads only if user is logged in
+    lead_ids = []
     if user and leads:
-        await save_leads_to_db(leads, db, llm, user)
-        print("💾 [DEBUG] Leads saved to DB")
+        lead_ids = await save_leads_to_db(leads, db, user)
+        print("💾 [DEBUG] Leads saved to DB, enrichment queued")
     else:
         print("🚫 [DEBUG] Skipped saving leads (guest mode)")
 
@@ -252,4 +354,41 @@ async def chat(message: str, db: AsyncSession, llm: ChatGoogleGenerativeAI, user
         "context": context,
         "message": warm_text,
         "leads": leads,
+        "lead_ids": lead_ids,
     }
+
+# -----------------------
+# Streaming chat (Server-Sent Events)
+# -----------------------
+async def chat_stream(message: str, llm: ChatGoogleGenerativeAI, user: Principal | None = None, refresh: bool = False, session_id: str | None = None):
+    """Streaming variant of chat(). Yields (event, data) pairs as each stage finishes:
+    - "context": extracted industry/location
+    - "lead": each lead as soon as its details arrive (with its "rank")
+    - "saved": ids of leads stored for a logged-in user
+    - "token": chunks of the assistant reply
+    - "done": end of stream
+
+    Runs as a streaming body, so it uses its own async_session().
+    """
+    context, extracted = await _update_context(message, llm, context_key(user, session_id))
+    leads = []
+
+    if extracted:
+        yield "context", context
+
+    if extracted and "industry" in context and "location" in context:
+        ranked = []
+        async for rank, lead in iter_leads(context["industry"], context["location"], limit=_lead_limit(user), refresh=refresh):
+            ranked.append((rank, lead))
+            yield "lead", {"rank": rank, **lead}
+        leads = [lead for _, lead in sorted(ranked, key=lambda item: item[0])]
+
+        if user and leads:
+            async with async_session() as db:
+                lead_ids = await save_leads_to_db(leads, db, user)
+            yield "saved", {"lead_ids": [str(lead_id) for lead_id in lead_ids]}
+
+    async for text in stream_human_response(message, context, leads, llm):
+        yield "token", {"text": text}
+
+    yield "done", {}
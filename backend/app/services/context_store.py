@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from cachetools import TTLCache
+from sqlmodel import select
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import get_settings
+from app.db.pruning import ExpiredRowPruner
+from app.db.session import async_session
+from app.models.chat_context import ChatContext
+
+settings = get_settings()
+
+
+class MemoryContextStore:
+    """Per-process chat context store. Bounded (least recently used keys are
+    evicted first) and every entry expires ttl_seconds after its last write."""
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+
+    async def get(self, key: str) -> dict:
+        return dict(self._cache.get(key, {}))
+
+    async def set(self, key: str, context: dict) -> None:
+        self._cache[key] = dict(context)
+
+
+class DatabaseContextStore:
+    """Chat context store backed by the chat_contexts table, shared by all
+    workers and kept across restarts. Entries past expires_at are ignored,
+    and set() has them deleted in the background (see ExpiredRowPruner)."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.pruner = ExpiredRowPruner(ChatContext.__table__.c.key, ChatContext.__table__.c.expires_at)
+
+    async def get(self, key: str) -> dict:
+        async with async_session() as session:
+            result = await session.exec(
+                select(ChatContext.context).where(
+                    ChatContext.key == key,
+                    ChatContext.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            return dict(result.one_or_none() or {})
+
+    async def set(self, key: str, context: dict) -> None:
+        expires_at = datetime.now(timezone.utc) + self.ttl
+        stmt = insert(ChatContext).values(key=key, context=context, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChatContext.key],
+            set_={"context": stmt.excluded.context, "expires_at": stmt.excluded.expires_at},
+        )
+        async with async_session() as session:
+            await session.exec(stmt)
+            await session.commit()
+        self.pruner.maybe_prune()
+
+
+_context_store: MemoryContextStore | DatabaseContextStore | None = None
+
+
+def get_context_store() -> MemoryContextStore | DatabaseContextStore:
+    """Return the configured store (CHAT_CONTEXT_BACKEND = "memory" or "database")."""
+    global _context_store
+    if _context_store is None:
+        if settings.CHAT_CONTEXT_BACKEND == "database":
+            _context_store = DatabaseContextStore(ttl_seconds=settings.CHAT_CONTEXT_TTL_SECONDS)
+        else:
+            _context_store = MemoryContextStore(
+                maxsize=settings.CHAT_CONTEXT_MAX_ENTRIES,
+                ttl_seconds=settings.CHAT_CONTEXT_TTL_SECONDS,
+            )
+    return _context_store
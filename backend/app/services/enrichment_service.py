@@ -0,0 +1,360 @@
+import asyncio
+import json
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from sqlalchemy import Interval, and_, literal, or_, update
+from sqlmodel import select
+from langchain.schema import HumanMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+from app.core.config import get_settings
+from app.core.llm import get_llm
+from app.db.session import async_session
+from app.models.lead import Lead, ENRICHMENT_PENDING, ENRICHMENT_PROCESSING, ENRICHMENT_DONE, ENRICHMENT_FAILED
+from app.services.lead_stats_service import LeadStatsService, stats_key
+
+# -----------------------
+# Settings & Globals
+# -----------------------
+settings = get_settings()
+
+# -----------------------
+# Lead Scoring & Summary
+# -----------------------
+async def score_and_summarize_lead(lead: dict, llm: ChatGoogleGenerativeAI) -> dict:
+    """Ask Gemini to score and summarize a lead"""
+    prompt = f"""
+        You are evaluating a business lead.
+        Lead info: {json.dumps(lead)}
+
+        Return JSON with:
+        - lead_score (1-100, based on business relevance, info completeness, and credibility)
+        - summary (1-2 sentence warm summary of the business)
+
+        Important instructions:
+        1. Output must be strictly valid JSON parsable by Python's json.loads().
+        2. Escape any double quotes inside string values as \\".
+        3. Use only JSON-safe characters; do not include extra symbols that would break JSON.
+        4. Do not include markdown, code fences, or extra text outside JSON.
+        5. Do not add commentary or explanations.
+        6. Use only simple words and phrases without apostrophes.
+
+        Example:
+        {{"lead_score": 85, "summary": "A popular restaurant in New York with strong reviews and online presence."}}
+        """
+
+    human_message = HumanMessage(content=prompt)
+    response = await llm.agenerate([[human_message]])
+    result_text = response.generations[0][0].text.strip()
+
+    # Clean up Gemini output
+    if result_text.startswith("```json"):
+        result_text = result_text[len("```json"):].strip()
+    if result_text.startswith("```"):
+        result_text = result_text[3:].strip()
+    if result_text.endswith("```"):
+        result_text = result_text[:-3].strip()
+
+    match = re.search(r"\{.*\}", result_text, re.DOTALL)
+    if match:
+        result_text = match.group(0)
+
+    try:
+        parsed = json.loads(result_text)
+        return {
+            "lead_score": int(parsed.get("lead_score", 0)),
+            "summary": parsed.get("summary", "No summary available.")
+        }
+    except Exception as e:
+        print("⚠️ Failed to parse Gemini output:", result_text, e)
+        return {"lead_score": 0, "summary": "No summary available."}
+
+async def _score_and_summarize_batch(leads: list, llm: ChatGoogleGenerativeAI) -> list[dict]:
+    """Score and summarize a batch of leads with a single Gemini call.
+
+    Results are matched back to leads by index. If the response cannot be
+    parsed, or some indexes are missing, those leads fall back to concurrent
+    per-lead calls to score_and_summarize_lead.
+    """
+    numbered = [{"index": i, "lead": lead} for i, lead in enumerate(leads)]
+    prompt = f"""
+        You are evaluating a list of business leads.
+        Leads: {json.dumps(numbered)}
+
+        Return a JSON array with exactly one object per lead, each with:
+        - index (the index of the lead as given above)
+        - lead_score (1-100, based on business relevance, info completeness, and credibility)
+        - summary (1-2 sentence warm summary of the business)
+
+        Important instructions:
+        1. Output must be strictly valid JSON parsable by Python's json.loads().
+        2. Escape any double quotes inside string values as \\".
+        3. Use only JSON-safe characters; do not include extra symbols that would break JSON.
+        4. Do not include markdown, code fences, or extra text outside JSON.
+        5. Do not add commentary or explanations.
+        6. Use only simple words and phrases without apostrophes.
+
+        Example:
+        [{{"index": 0, "lead_score": 85, "summary": "A popular restaurant in New York with strong reviews and online presence."}}]
+        """
+
+    human_message = HumanMessage(content=prompt)
+    response = await llm.agenerate([[human_message]])
+    result_text = response.generations[0][0].text.strip()
+
+    match = re.search(r"\[.*\]", result_text, re.DOTALL)
+    if match:
+        result_text = match.group(0)
+
+    results: dict[int, dict] = {}
+    try:
+        for item in json.loads(result_text):
+            index = int(item["index"])
+            if 0 <= index < len(leads):
+                results[index] = {
+                    "lead_score": int(item.get("lead_score", 0)),
+                    "summary": item.get("summary", "No summary available."),
+                }
+    except Exception as e:
+        print("⚠️ Failed to parse batched Gemini output, falling back to per-lead calls:", e)
+        results = {}
+
+    missing = [i for i in range(len(leads)) if i not in results]
+    if missing:
+        fallback = await asyncio.gather(
+            *(score_and_summarize_lead(leads[i], llm) for i in missing)
+        )
+        results.update(zip(missing, fallback))
+
+    return [results[i] for i in range(len(leads))]
+
+
+async def score_and_summarize_leads(leads: list, llm: ChatGoogleGenerativeAI) -> list[dict | None]:
+    """Score and summarize many leads, LEAD_ENRICHMENT_BATCH_SIZE per Gemini call.
+    Returns one enrichment dict per lead, in the same order as `leads`; leads
+    in a batch whose Gemini call failed get None instead.
+    """
+    size = max(settings.LEAD_ENRICHMENT_BATCH_SIZE, 1)
+    batches = [leads[i:i + size] for i in range(0, len(leads), size)]
+    batch_results = await asyncio.gather(
+        *(_score_and_summarize_batch(batch, llm) for batch in batches),
+        return_exceptions=True,
+    )
+    results = []
+    for batch, batch_result in zip(batches, batch_results):
+        if isinstance(batch_result, BaseException):
+            print("⚠️ Lead enrichment batch failed:", batch_result)
+            batch_result = [None] * len(batch)
+        results.extend(batch_result)
+    return results
+
+# -----------------------
+# Enrichment job
+# -----------------------
+def _lead_payload(lead) -> dict:
+    return {
+        "business_name": lead.business_name,
+        "industry": lead.industry,
+        "address": lead.address,
+        "website": lead.website,
+        "contact_number": lead.contact_number,
+    }
+
+
+async def _claim_leads(lead_ids: list[uuid.UUID] | None, limit: int) -> tuple[datetime, list]:
+    """Mark up to `limit` pending leads (or stale claims) as processing and commit.
+
+    SKIP LOCKED keeps concurrent workers from claiming the same rows; the
+    claim is committed straight away, so no lock is held while Gemini runs.
+    Leads put back after a failed attempt wait LEAD_ENRICHMENT_RETRY_DELAY_SECONDS
+    per attempt so far (measured from their last claim).
+    """
+    claimed_at = datetime.now(timezone.utc)
+    stale_before = claimed_at - timedelta(seconds=settings.LEAD_ENRICHMENT_CLAIM_TIMEOUT_SECONDS)
+    retry_delay = literal(timedelta(seconds=settings.LEAD_ENRICHMENT_RETRY_DELAY_SECONDS), Interval)
+    candidates = (
+        select(Lead.id)
+        .where(or_(
+            and_(
+                Lead.enrichment_status == ENRICHMENT_PENDING,
+                or_(
+                    Lead.enrichment_attempts == 0,
+                    Lead.enrichment_claimed_at + Lead.enrichment_attempts * retry_delay <= claimed_at,
+                ),
+            ),
+            and_(Lead.enrichment_status == ENRICHMENT_PROCESSING, Lead.enrichment_claimed_at < stale_before),
+        ))
+        .order_by(Lead.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if lead_ids is not None:
+        candidates = candidates.where(Lead.id.in_(lead_ids))
+
+    async with async_session() as session:
+        result = await session.exec(
+            update(Lead)
+            .where(Lead.id.in_(candidates))
+            # A claim is bookkeeping, not an edit: leave updated_at alone
+            .values(enrichment_status=ENRICHMENT_PROCESSING, enrichment_claimed_at=claimed_at, updated_at=Lead.updated_at)
+            .returning(Lead.id, Lead.business_name, Lead.industry, Lead.address, Lead.website, Lead.contact_number)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.all()
+        await session.commit()
+    return claimed_at, claimed
+
+
+async def _save_enrichments(claimed_at: datetime, enrichments: dict[uuid.UUID, dict | None]) -> None:
+    """Write results for our claimed leads. A lead whose result is None goes
+    back to pending for a retry, or is marked failed after
+    LEAD_ENRICHMENT_MAX_ATTEMPTS attempts.
+
+    Leads deleted, re-claimed or re-queued while Gemini was running no longer
+    carry our claim and are left alone.
+    """
+    async with async_session() as session:
+        result = await session.exec(
+            select(Lead)
+            .where(
+                Lead.id.in_(list(enrichments)),
+                Lead.enrichment_status == ENRICHMENT_PROCESSING,
+                Lead.enrichment_claimed_at == claimed_at,
+            )
+            .with_for_update()
+        )
+        leads = result.all()
+        if not leads:
+            return
+
+        scored = [lead for lead in leads if enrichments[lead.id] is not None]
+        for lead in leads:
+            if enrichments[lead.id] is None:
+                lead.enrichment_attempts += 1
+                retry = lead.enrichment_attempts < settings.LEAD_ENRICHMENT_MAX_ATTEMPTS
+                lead.enrichment_status = ENRICHMENT_PENDING if retry else ENRICHMENT_FAILED
+
+        # Scoring moves leads between score buckets
+        old_stats_keys = [stats_key(l) for l in scored]
+        for lead in scored:
+            enrichment = enrichments[lead.id]
+            lead.lead_score = enrichment.get("lead_score", 0)
+            lead.summary = enrichment.get("summary", "")
+            lead.enrichment_status = ENRICHMENT_DONE
+            lead.enrichment_attempts = 0
+            lead.enriched_at = datetime.now(timezone.utc)
+        if scored:
+            await LeadStatsService(session).record(
+                added=[stats_key(l) for l in scored], removed=old_stats_keys
+            )
+
+        session.add_all(leads)
+        await session.commit()
+
+
+async def enrich_pending_leads(llm: ChatGoogleGenerativeAI, lead_ids: Iterable[uuid.UUID] | None = None, limit: int = 50) -> int:
+    """Fill in lead_score/summary for pending leads and return how many were processed.
+
+    With lead_ids, only those leads are considered; otherwise the oldest
+    pending leads are picked up. Leads are claimed in one short transaction,
+    scored with no transaction open and written back in a second one, so
+    saves and edits of the same leads never wait on Gemini. Claims left
+    behind by a crashed or stopped worker are retried after
+    LEAD_ENRICHMENT_CLAIM_TIMEOUT_SECONDS, and leads in a failed Gemini
+    batch are retried with backoff.
+    """
+    claimed_at, claimed = await _claim_leads(list(lead_ids) if lead_ids is not None else None, limit)
+    if not claimed:
+        return 0
+
+    try:
+        results = await score_and_summarize_leads([_lead_payload(l) for l in claimed], llm)
+    except Exception as e:
+        print("⚠️ Lead enrichment failed:", e)
+        results = [None] * len(claimed)
+
+    await _save_enrichments(claimed_at, {lead.id: result for lead, result in zip(claimed, results)})
+    return len(claimed)
+
+# -----------------------
+# Background worker
+# -----------------------
+class EnrichmentQueue:
+    """In-process asyncio task pool that enriches leads off the request path.
+
+    Jobs are lists of lead ids. The queue only speeds up fresh leads: one
+    more task runs the run_worker() polling loop, so pending leads whose ids
+    were lost on a restart and stale "processing" claims are still picked up.
+    With LEAD_ENRICHMENT_BACKEND="external" the queue does not run workers
+    and enqueue() is a no-op: pending rows stay in the database for a
+    separate process running `python -m app.services.enrichment_service` to
+    pick up.
+    """
+
+    def __init__(self, llm: ChatGoogleGenerativeAI, workers: int = 2, in_process: bool = True, poll_interval: float = 30.0):
+        self.llm = llm
+        self.workers = workers
+        self.in_process = in_process
+        self.poll_interval = poll_interval
+        self._queue: asyncio.Queue[list[uuid.UUID]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if not self.in_process or self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(run_worker(self.poll_interval, llm=self.llm)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, lead_ids: list[uuid.UUID]) -> None:
+        if self.in_process and lead_ids:
+            await self._queue.put(list(lead_ids))
+
+    async def _worker(self) -> None:
+        while True:
+            lead_ids = await self._queue.get()
+            try:
+                await enrich_pending_leads(self.llm, lead_ids=lead_ids, limit=len(lead_ids))
+            except Exception as e:
+                print("⚠️ Enrichment job crashed:", e)
+            finally:
+                self._queue.task_done()
+
+
+_enrichment_queue: EnrichmentQueue | None = None
+
+
+def get_enrichment_queue() -> EnrichmentQueue:
+    global _enrichment_queue
+    if _enrichment_queue is None:
+        _enrichment_queue = EnrichmentQueue(
+            llm=get_llm(),
+            workers=settings.LEAD_ENRICHMENT_WORKERS,
+            in_process=settings.LEAD_ENRICHMENT_BACKEND == "inprocess",
+            poll_interval=settings.LEAD_ENRICHMENT_POLL_INTERVAL_SECONDS,
+        )
+    return _enrichment_queue
+
+
+async def run_worker(poll_interval: float = 2.0, llm: ChatGoogleGenerativeAI | None = None) -> None:
+    """Worker loop: poll the leads table for pending enrichment and stale
+    claims. Runs standalone, and inside EnrichmentQueue as its sweeper."""
+    llm = llm or get_llm()
+    while True:
+        try:
+            processed = await enrich_pending_leads(llm, limit=settings.LEAD_ENRICHMENT_BATCH_SIZE)
+        except Exception as e:
+            print("⚠️ Enrichment poll failed:", e)
+            processed = 0
+        if not processed:
+            await asyncio.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -0,0 +1,113 @@
+import re
+from datetime import datetime, timedelta, timezone
+from cachetools import LRUCache
+from sqlmodel import select
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import get_settings
+from app.db.pruning import ExpiredRowPruner
+from app.db.session import async_session
+from app.models.geocode_cache import GeocodeCacheEntry
+from app.services.maps_service import get_maps_client
+
+settings = get_settings()
+
+
+def normalize_location(location: str) -> str:
+    """Lowercase, trim and collapse whitespace/punctuation so that
+    "New York", " new york " and "New York." share one cache key."""
+    location = re.sub(r"[^\w\s,]", " ", location.lower())
+    location = re.sub(r"\s*,\s*", ", ", location)
+    return re.sub(r"\s+", " ", location).strip(" ,")
+
+
+class GeocodeCache:
+    """Two-tier geocode cache: a per-process LRU in front of the
+    geocode_cache table, which is shared by all workers and survives
+    restarts. Entries expire after GEOCODE_CACHE_TTL_SECONDS; locations
+    Google can't resolve are cached too, for GEOCODE_NEGATIVE_CACHE_TTL_SECONDS.
+    Expired rows are deleted in the background (see ExpiredRowPruner).
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int, negative_ttl_seconds: int):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.negative_ttl = timedelta(seconds=negative_ttl_seconds)
+        self._memory: LRUCache = LRUCache(maxsize=maxsize)
+        self.pruner = ExpiredRowPruner(GeocodeCacheEntry.__table__.c.query, GeocodeCacheEntry.__table__.c.expires_at)
+
+    async def geocode(self, location: str) -> dict | None:
+        """Return {"lat": ..., "lng": ...} for a location, or None if Google can't resolve it."""
+        key = normalize_location(location)
+        now = datetime.now(timezone.utc)
+
+        cached = self._memory.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        entry = await self._load(key, now)
+        if entry:
+            latlng = {"lat": entry.lat, "lng": entry.lng} if entry.lat is not None else None
+            self._memory[key] = (latlng, entry.expires_at)
+            return latlng
+
+        results = await get_maps_client().geocode(location)
+        if results:
+            latlng = results[0]["geometry"]["location"]
+            formatted_address = results[0].get("formatted_address")
+            expires_at = now + self.ttl
+        else:
+            latlng, formatted_address = None, None
+            expires_at = now + self.negative_ttl
+        self._memory[key] = (latlng, expires_at)
+        await self._store(key, latlng, formatted_address, expires_at)
+        return latlng
+
+    async def _load(self, key: str, now: datetime) -> GeocodeCacheEntry | None:
+        try:
+            async with async_session() as session:
+                result = await session.exec(
+                    select(GeocodeCacheEntry).where(
+                        GeocodeCacheEntry.query == key,
+                        GeocodeCacheEntry.expires_at > now,
+                    )
+                )
+                return result.one_or_none()
+        except Exception as e:
+            # The cache must never break lead lookups
+            print("⚠️ Geocode cache read failed:", e)
+            return None
+
+    async def _store(self, key: str, latlng: dict | None, formatted_address: str | None, expires_at: datetime) -> None:
+        values = {
+            "query": key,
+            "lat": latlng["lat"] if latlng else None,
+            "lng": latlng["lng"] if latlng else None,
+            "formatted_address": formatted_address,
+            "expires_at": expires_at,
+        }
+        stmt = insert(GeocodeCacheEntry).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GeocodeCacheEntry.query],
+            set_={k: stmt.excluded[k] for k in ("lat", "lng", "formatted_address", "expires_at")},
+        )
+        try:
+            async with async_session() as session:
+                await session.exec(stmt)
+                await session.commit()
+        except Exception as e:
+            print("⚠️ Geocode cache write failed:", e)
+            return
+        self.pruner.maybe_prune()
+
+
+_geocode_cache: GeocodeCache | None = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache(
+            maxsize=settings.GEOCODE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.GEOCODE_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=settings.GEOCODE_NEGATIVE_CACHE_TTL_SECONDS,
+        )
+    return _geocode_cache
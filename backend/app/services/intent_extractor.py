@@ -0,0 +1,123 @@
+import re
+
+# -----------------------
+# Gazetteers
+# -----------------------
+INDUSTRY_KEYWORDS = frozenset({
+    "accountants", "accounting firms", "advertising agencies", "architects", "auto repair shops",
+    "bakeries", "banks", "barbers", "barbershops", "bars", "beauty salons", "bookstores",
+    "breweries", "cafes", "car dealers", "car dealerships", "car washes", "caterers",
+    "chiropractors", "cleaning services", "clinics", "clothing stores", "coffee shops",
+    "construction companies", "consultants", "coworking spaces", "daycares", "dentists",
+    "dental clinics", "digital marketing agencies", "doctors", "electricians", "event planners",
+    "fitness centers", "florists", "furniture stores", "gas stations", "grocery stores", "gyms",
+    "hair salons", "hardware stores", "hospitals", "hotels", "insurance agencies",
+    "interior designers", "it companies", "jewelry stores", "law firms", "lawyers",
+    "logistics companies", "manufacturers", "marketing agencies", "nail salons", "nightclubs",
+    "opticians", "pet shops", "pet stores", "pharmacies", "photographers", "physiotherapists",
+    "pizzerias", "plumbers", "pubs", "real estate agencies", "real estate agents",
+    "restaurants", "retail stores", "roofers", "schools", "shoe stores", "software companies",
+    "spas", "startups", "supermarkets", "tattoo shops", "travel agencies", "tutors",
+    "universities", "veterinarians", "vets", "web design agencies", "wedding planners",
+    "yoga studios",
+})
+
+LOCATIONS = {
+    name.lower(): name
+    for name in (
+        # Cities
+        "Amsterdam", "Athens", "Atlanta", "Auckland", "Austin", "Bangalore", "Bangkok",
+        "Barcelona", "Beijing", "Berlin", "Bogota", "Boston", "Brisbane", "Brussels",
+        "Budapest", "Buenos Aires", "Cairo", "Calgary", "Cape Town", "Chennai", "Chicago",
+        "Copenhagen", "Dallas", "Delhi", "Denver", "Detroit", "Dhaka", "Dubai", "Dublin",
+        "Edinburgh", "Frankfurt", "Geneva", "Hamburg", "Helsinki", "Ho Chi Minh City",
+        "Hong Kong", "Houston", "Hyderabad", "Istanbul", "Jakarta", "Johannesburg",
+        "Karachi", "Kathmandu", "Kolkata", "Kuala Lumpur", "Lagos", "Lahore", "Las Vegas",
+        "Lima", "Lisbon", "London", "Los Angeles", "Lyon", "Madrid", "Manchester", "Manila",
+        "Melbourne", "Mexico City", "Miami", "Milan", "Montreal", "Moscow", "Mumbai",
+        "Munich", "Nairobi", "New Delhi", "New York", "New York City", "Osaka", "Oslo",
+        "Ottawa", "Paris", "Perth", "Philadelphia", "Phoenix", "Pokhara", "Prague", "Pune",
+        "Rio de Janeiro", "Riyadh", "Rome", "Rotterdam", "San Diego", "San Francisco",
+        "San Jose", "Santiago", "Sao Paulo", "Seattle", "Seoul", "Shanghai", "Singapore",
+        "Stockholm", "Sydney", "Taipei", "Tokyo", "Toronto", "Vancouver", "Vienna",
+        "Warsaw", "Washington", "Zurich",
+        # Countries
+        "Argentina", "Australia", "Austria", "Bangladesh", "Belgium", "Brazil", "Canada",
+        "Chile", "China", "Colombia", "Denmark", "Egypt", "Finland", "France", "Germany",
+        "Greece", "India", "Indonesia", "Ireland", "Italy", "Japan", "Kenya", "Malaysia",
+        "Mexico", "Nepal", "Netherlands", "New Zealand", "Nigeria", "Norway", "Pakistan",
+        "Peru", "Philippines", "Poland", "Portugal", "Saudi Arabia", "South Africa",
+        "South Korea", "Spain", "Sweden", "Switzerland", "Thailand", "Turkey", "UAE", "UK",
+        "United Arab Emirates", "United Kingdom", "United States", "USA", "Vietnam",
+    )
+}
+
+# Words that carry no intent of their own; a message made only of these plus
+# a known industry and/or location is handled without the LLM.
+FILLER_WORDS = frozenset({
+    "a", "all", "any", "around", "at", "best", "can", "find", "for", "from", "get", "give",
+    "i", "in", "is", "leads", "list", "looking", "me", "near", "need", "of", "please",
+    "search", "show", "some", "the", "there", "top", "want", "what", "which", "within",
+    "you",
+})
+
+
+def _alternation(phrases) -> re.Pattern:
+    # Longest first, so "new york city" wins over "new york"
+    ordered = sorted(phrases, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(p) for p in ordered) + r")\b")
+
+
+_INDUSTRY_RE = _alternation(INDUSTRY_KEYWORDS)
+_LOCATION_RE = _alternation(LOCATIONS)
+
+# -----------------------
+# Fast-path metrics
+# -----------------------
+_metrics = {"fast_path_hits": 0, "llm_fallbacks": 0}
+
+
+def record_llm_fallback() -> None:
+    _metrics["llm_fallbacks"] += 1
+
+
+def get_metrics() -> dict:
+    total = _metrics["fast_path_hits"] + _metrics["llm_fallbacks"]
+    return {**_metrics, "hit_ratio": _metrics["fast_path_hits"] / total if total else 0.0}
+
+
+# -----------------------
+# Extractor
+# -----------------------
+def fast_extract(message: str | None) -> dict | None:
+    """Rule-based industry/location extraction for common messages such as
+    "cafes in Berlin" or "Berlin".
+
+    Returns {"industry": ..., "location": ...} (missing fields are None) in the
+    same shape as the LLM extraction, or None when the message contains
+    anything beyond a known industry, a known location and filler words, in
+    which case the caller should fall back to the LLM.
+    """
+    if not message:
+        return None
+
+    text = re.sub(r"[^\w\s]", " ", message.lower())
+    text = re.sub(r"\s+", " ", text).strip()
+
+    industry_match = _INDUSTRY_RE.search(text)
+    location_match = _LOCATION_RE.search(text)
+    if not industry_match and not location_match:
+        return None
+
+    remainder = text
+    for match in (industry_match, location_match):
+        if match:
+            remainder = remainder.replace(match.group(0), " ", 1)
+    if any(word not in FILLER_WORDS for word in remainder.split()):
+        return None
+
+    _metrics["fast_path_hits"] += 1
+    return {
+        "industry": industry_match.group(0) if industry_match else None,
+        "location": LOCATIONS[location_match.group(0)] if location_match else None,
+    }
@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+import uuid
+from typing import BinaryIO, Iterator
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert
+from starlette.concurrency import run_in_threadpool
+from app.models.lead import Lead, new_lead
+from app.schemas.lead import LeadCreate
+from app.services.lead_stats_service import LeadStatsService, stats_key
+
+IMPORT_FORMATS = ("csv", "ndjson")
+# Rows per INSERT statement: at most 1000, and never more bind parameters
+# (one per column per row) than Postgres allows in one statement
+POSTGRES_MAX_BIND_PARAMS = 32767
+IMPORT_CHUNK_SIZE = min(1000, POSTGRES_MAX_BIND_PARAMS // len(Lead.__table__.columns))
+# Cap on the per-row error report; the failed count is always exact
+MAX_REPORTED_ERRORS = 1000
+
+
+# -----------------------
+# Parsing
+# -----------------------
+def _csv_rows(file: BinaryIO) -> Iterator[tuple[int, dict | str]]:
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        # Empty cells are missing values (field defaults apply), not empty strings
+        yield reader.line_num, {k: v for k, v in row.items() if k and v != ""}
+
+
+def _ndjson_rows(file: BinaryIO) -> Iterator[tuple[int, dict | str]]:
+    for line_num, line in enumerate(io.TextIOWrapper(file, encoding="utf-8-sig"), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_num, f"invalid JSON: {e.msg}"
+            continue
+        yield line_num, row if isinstance(row, dict) else "expected a JSON object"
+
+
+def _validate(row: dict, user_id: uuid.UUID) -> dict:
+    lead_data = LeadCreate.model_validate({**row, "user_id": user_id})
+    return new_lead(**lead_data.model_dump()).model_dump()
+
+
+def _read_chunk(rows: Iterator, user_id: uuid.UUID, size: int) -> tuple[list, list]:
+    """Parse and validate up to `size` rows. Returns ([(line, lead dict)], [error])."""
+    valid, errors = [], []
+    for line_num, row in rows:
+        if isinstance(row, str):
+            errors.append({"line": line_num, "errors": [row]})
+        else:
+            try:
+                valid.append((line_num, _validate(row, user_id)))
+            except ValidationError as e:
+                errors.append({
+                    "line": line_num,
+                    "errors": [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()],
+                })
+        if len(valid) + len(errors) >= size:
+            break
+    return valid, errors
+
+
+# -----------------------
+# Import
+# -----------------------
+class LeadImportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def import_leads(self, file: BinaryIO, fmt: str, user_id: uuid.UUID) -> dict:
+        """Load a CSV (header row of LeadCreate field names) or NDJSON file
+        into the user's leads.
+
+        Rows are validated against LeadCreate and inserted IMPORT_CHUNK_SIZE
+        at a time with one multi-row INSERT ... ON CONFLICT DO NOTHING,
+        committed per chunk. Invalid rows, rows whose email or business
+        (identity_hash) already exists and chunks the database rejects are
+        skipped and listed in the returned error report.
+        """
+        if fmt not in IMPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported import format: {fmt}")
+        rows = _csv_rows(file) if fmt == "csv" else _ndjson_rows(file)
+
+        report = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+        seen_emails: set[str] = set()
+        seen_identities: set[str] = set()
+
+        while True:
+            # Parsing/validation is CPU-bound; keep it off the event loop
+            try:
+                valid, errors = await run_in_threadpool(_read_chunk, rows, user_id, IMPORT_CHUNK_SIZE)
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise HTTPException(status_code=400, detail=f"Could not parse file: {e}")
+            if not valid and not errors:
+                break
+            report["received"] += len(valid) + len(errors)
+
+            # Duplicates within the file: keep the first occurrence
+            batch = []
+            for line_num, lead in valid:
+                email = lead["email"]
+                if email is not None and email in seen_emails:
+                    errors.append({"line": line_num, "errors": [f"email: duplicate of an earlier row ({email})"]})
+                    continue
+                if lead["identity_hash"] in seen_identities:
+                    errors.append({"line": line_num, "errors": ["duplicate of an earlier row (same business)"]})
+                    continue
+                if email is not None:
+                    seen_emails.add(email)
+                seen_identities.add(lead["identity_hash"])
+                batch.append((line_num, lead))
+
+            try:
+                skipped = await self._insert_chunk(user_id, [lead for _, lead in batch])
+            except SQLAlchemyError as e:
+                # Earlier chunks stay committed; this one is reported as failed
+                await self.session.rollback()
+                print("⚠️ Lead import chunk failed:", e)
+                skipped = {lead["identity_hash"]: "not imported: database error" for _, lead in batch}
+            for line_num, lead in batch:
+                if lead["identity_hash"] in skipped:
+                    errors.append({"line": line_num, "errors": [skipped[lead["identity_hash"]]]})
+
+            report["failed"] += len(errors)
+            report["errors"].extend(errors[:MAX_REPORTED_ERRORS - len(report["errors"])])
+
+        report["inserted"] = report["received"] - report["failed"]
+        report["errors"].sort(key=lambda e: e["line"])
+        report["errors_truncated"] = report["failed"] > len(report["errors"])
+        return report
+
+    async def _insert_chunk(self, user_id: uuid.UUID, leads: list[dict]) -> dict[str, str]:
+        """Insert one chunk; returns {identity_hash: reason} for the rows that were skipped"""
+        if not leads:
+            return {}
+        stmt = (
+            insert(Lead)
+            .values(leads)
+            # Skips rows that clash on email or on (user_id, identity_hash)
+            .on_conflict_do_nothing()
+            .returning(Lead.user_id, Lead.industry, Lead.lead_score, Lead.verified, Lead.identity_hash)
+        )
+        result = await self.session.exec(stmt)
+        inserted = result.all()
+        await LeadStatsService(self.session).record(added=[stats_key(row) for row in inserted])
+
+        inserted_hashes = {row.identity_hash for row in inserted}
+        skipped = [lead for lead in leads if lead["identity_hash"] not in inserted_hashes]
+        reasons = await self._skip_reasons(user_id, skipped) if skipped else {}
+        await self.session.commit()
+        return reasons
+
+    async def _skip_reasons(self, user_id: uuid.UUID, leads: list[dict]) -> dict[str, str]:
+        """Why each lead hit a conflict. Emails are unique across all users, so
+        a clash with someone else's lead is reported without saying so."""
+        emails = [lead["email"] for lead in leads if lead["email"] is not None]
+        result = await self.session.exec(
+            select(Lead.email, Lead.identity_hash).where(
+                Lead.user_id == user_id,
+                or_(Lead.identity_hash.in_([lead["identity_hash"] for lead in leads]), Lead.email.in_(emails)),
+            )
+        )
+        own = result.all()
+        own_hashes = {row.identity_hash for row in own}
+        own_emails = {row.email for row in own}
+
+        reasons = {}
+        for lead in leads:
+            if lead["identity_hash"] in own_hashes:
+                reasons[lead["identity_hash"]] = "already in your leads (same business)"
+            elif lead["email"] in own_emails:
+                reasons[lead["identity_hash"]] = "email: already in your leads"
+            else:
+                reasons[lead["identity_hash"]] = "email: cannot be imported"
+        return reasons
@@ -1,75 +1,262 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, func
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from sqlalchemy import tuple_, any_, bindparam, update, delete
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+import csv
+import io
+import json
 import uuid
 
-from app.models.lead import Lead
-from app.schemas.lead import LeadCreate, LeadUpdate
+from app.db.explain import Explain
+from app.db.session import async_session
+from app.models.lead import Lead, new_lead, LEAD_SEARCH_VECTOR, LEAD_SEARCH_CONFIG, ENRICHMENT_PENDING, ENRICHMENT_PROCESSING, ENRICHMENT_DONE, ENRICHMENT_FAILED
+from app.schemas.lead import LeadCreate, LeadUpdate, LeadRead, LeadPreview, LeadFilter
+from app.services.lead_stats_service import LeadStatsService, stats_key
+from app.utils.pagination import encode_cursor, decode_cursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Sortable columns for keyset pagination (always descending, id as tie-breaker).
+# "relevance" sorts by full-text rank and needs a search query.
+LEAD_SORT_COLUMNS = {
+    "created_at": Lead.created_at,
+    "lead_score": Lead.lead_score,
+}
+
+# Fields that feed lead_stats; bulk updates touching them rebuild the user's stats
+STATS_FIELDS = {"industry", "lead_score", "verified"}
+
+# Columns behind LeadRead. Read paths select just these as plain rows and
+# turn them into dicts, instead of loading ORM objects and dumping them.
+LEAD_READ_FIELDS = list(LeadRead.model_fields)
+LEAD_READ_COLUMNS = [Lead.__table__.c[field] for field in LEAD_READ_FIELDS]
+
+# Named projections for list reads; "preview" is what the leads table shows
+LEAD_VIEWS = {
+    "full": LEAD_READ_FIELDS,
+    "preview": ["id", "lead_score", *LeadPreview.model_fields],
+}
+
+EXPORT_FORMATS = ("csv", "ndjson")
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def _lead_row(row, fields: List[str] = LEAD_READ_FIELDS) -> dict:
+    return dict(zip(fields, row))
+
+
+def resolve_fields(view: str = "full", fields: Optional[List[str]] = None) -> List[str]:
+    """Columns to read for a view, or for an explicit sparse fieldset
+    (which wins over the view). id is always included."""
+    if not fields:
+        return LEAD_VIEWS[view]
+    unknown = [f for f in fields if f not in LEAD_READ_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown lead fields: {', '.join(unknown)}")
+    return ["id", *dict.fromkeys(f for f in fields if f != "id")]
+
+
+def _columns(fields: List[str]) -> list:
+    return [Lead.__table__.c[field] for field in fields]
+
+
+def _search_query(q: str):
+    return func.websearch_to_tsquery(LEAD_SEARCH_CONFIG, q)
+
+
+def _parse_cursor(cursor: str) -> tuple:
+    try:
+        sort, last_value, last_id = decode_cursor(cursor)
+        if sort == "created_at":
+            last_value = datetime.fromisoformat(last_value)
+        elif sort == "lead_score":
+            last_value = int(last_value)
+        elif sort == "relevance":
+            last_value = float(last_value)
+        return sort, last_value, uuid.UUID(last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _lead_filters(
+    user_id: Optional[uuid.UUID] = None,
+    industry: Optional[str] = None,
+    min_lead_score: Optional[int] = None,
+    max_lead_score: Optional[int] = None,
+    q: Optional[str] = None,
+) -> list:
+    """WHERE clauses shared by every lead list/count query"""
+    filters = []
+
+    # 🔹 filter by user_id if provided
+    if user_id:
+        filters.append(Lead.user_id == user_id)
+
+    if industry:
+        filters.append(Lead.industry.ilike(f"%{industry}%"))
+    if min_lead_score is not None:
+        filters.append(Lead.lead_score >= min_lead_score)
+    if max_lead_score is not None:
+        filters.append(Lead.lead_score <= max_lead_score)
+    if q:
+        filters.append(LEAD_SEARCH_VECTOR.op("@@")(_search_query(q)))
+    return filters
+
 
 class LeadService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def _fetch_page(
+        self,
+        filters: list,
+        q: Optional[str],
+        sort: Optional[str],
+        cursor: Optional[str],
+        limit: int,
+        fields: List[str] = LEAD_READ_FIELDS,
+        extra_columns: tuple = (),
+    ) -> Tuple[list, Optional[str]]:
+        """Run one keyset page query. Returns the rows (the `fields` columns,
+        then sort_value and any extra_columns) and the cursor for the next
+        page."""
+        sort = sort or ("relevance" if q else "created_at")
+        if sort == "relevance":
+            if not q:
+                raise HTTPException(status_code=400, detail="Sorting by relevance requires q")
+            sort_key = func.ts_rank(LEAD_SEARCH_VECTOR, _search_query(q))
+        else:
+            sort_key = LEAD_SORT_COLUMNS[sort]
+        limit = min(limit, MAX_PAGE_SIZE)
+        query = select(*_columns(fields), sort_key.label("sort_value"), *extra_columns).where(*filters)
+
+        if cursor:
+            cursor_sort, last_value, last_id = _parse_cursor(cursor)
+            if cursor_sort != sort:
+                raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+            query = query.where(tuple_(sort_key, Lead.id) < tuple_(last_value, last_id))
+
+        query = query.order_by(sort_key.desc(), Lead.id.desc()).limit(limit + 1)
+
+        result = await self.session.exec(query)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, rows[-1].sort_value, rows[-1].id)
+
+        return rows, next_cursor
+
     async def list_leads(
         self,
         user_id: Optional[uuid.UUID] = None,  # 🔹 add user_id
         industry: Optional[str] = None,
         min_lead_score: Optional[int] = None,
-        max_lead_score: Optional[int] = None
-    ) -> List[dict]:
-        query = select(Lead)
+        max_lead_score: Optional[int] = None,
+        q: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: List[str] = LEAD_READ_FIELDS,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Return one page of leads and the cursor for the next page (None on
+        the last page). Pages are newest first by default, or best match first
+        when a search query `q` is given.
 
-        # 🔹 filter by user_id if provided
-        if user_id:
-            query = query.where(Lead.user_id == user_id)
+        Keyset pagination on (sort key, id): each page seeks directly past
+        the previous one, so deep pages cost the same as the first.
+        """
+        filters = _lead_filters(user_id, industry, min_lead_score, max_lead_score, q)
+        rows, next_cursor = await self._fetch_page(filters, q, sort, cursor, limit, fields)
+        return [_lead_row(row, fields) for row in rows], next_cursor
+
+    async def list_leads_with_total(
+        self,
+        user_id: Optional[uuid.UUID] = None,
+        industry: Optional[str] = None,
+        min_lead_score: Optional[int] = None,
+        max_lead_score: Optional[int] = None,
+        q: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        count_mode: str = "exact",
+        fields: List[str] = LEAD_READ_FIELDS,
+    ) -> dict:
+        """One page of leads plus the total matching the filters.
 
-        if industry:
-            query = query.where(Lead.industry.ilike(f"%{industry}%"))
-        if min_lead_score is not None:
-            query = query.where(Lead.lead_score >= min_lead_score)
-        if max_lead_score is not None:
-            query = query.where(Lead.lead_score <= max_lead_score)
+        count_mode="exact" computes the total as a scalar subquery of the
+        page query, so both come back in a single round-trip.
+        count_mode="estimated" uses the planner's row estimate instead,
+        which costs the same however many rows match.
+        """
+        filters = _lead_filters(user_id, industry, min_lead_score, max_lead_score, q)
 
-        result = await self.session.exec(query)
-        leads = result.all()
+        if count_mode == "estimated":
+            total = await self._estimate_count(filters)
+            rows, next_cursor = await self._fetch_page(filters, q, sort, cursor, limit, fields)
+        else:
+            # correlate(None): count the whole filtered set, not the outer row
+            total_column = select(func.count(Lead.id)).where(*filters).correlate(None).scalar_subquery().label("total")
+            rows, next_cursor = await self._fetch_page(filters, q, sort, cursor, limit, fields, (total_column,))
+            # An empty page carries no total column (e.g. a cursor past the end)
+            total = rows[0].total if rows else await self._count(filters)
 
-        return [lead.model_dump() for lead in leads]
+        return {
+            "items": [_lead_row(row, fields) for row in rows],
+            "total": total,
+            "total_is_estimate": count_mode == "estimated",
+            "next_cursor": next_cursor,
+        }
+
+    async def _count(self, filters: list) -> int:
+        result = await self.session.exec(select(func.count(Lead.id)).where(*filters))
+        return result.one()
+
+    async def _estimate_count(self, filters: list) -> int:
+        result = await self.session.exec(Explain(select(Lead.id).where(*filters)))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def count_leads(
         self,
         user_id: Optional[uuid.UUID] = None,  # 🔹 add user_id
         industry: Optional[str] = None,
         min_lead_score: Optional[int] = None,
-        max_lead_score: Optional[int] = None
+        max_lead_score: Optional[int] = None,
+        q: Optional[str] = None,
+        count_mode: str = "exact",
     ) -> int:
-        from sqlmodel import func, select
-        
-        query = select(func.count(Lead.id))
-
-        # 🔹 filter by user_id if provided
-        if user_id:
-            query = query.where(Lead.user_id == user_id)
-
-        if industry:
-            query = query.where(Lead.industry.ilike(f"%{industry}%"))
-        if min_lead_score is not None:
-            query = query.where(Lead.lead_score >= min_lead_score)
-        if max_lead_score is not None:
-            query = query.where(Lead.lead_score <= max_lead_score)
-
-        result = await self.session.exec(query)
-        return result.one()
+        filters = _lead_filters(user_id, industry, min_lead_score, max_lead_score, q)
+        if count_mode == "estimated":
+            return await self._estimate_count(filters)
+        return await self._count(filters)
 
     async def get_lead(self, lead_id: uuid.UUID) -> dict:
-        lead = await self.session.get(Lead, lead_id)
-        if not lead:
+        result = await self.session.exec(select(*LEAD_READ_COLUMNS).where(Lead.id == lead_id))
+        row = result.first()
+        if not row:
             raise HTTPException(status_code=404, detail="Lead not found")
-        return lead.model_dump()
+        return _lead_row(row)
 
     async def create_lead(self, data: LeadCreate) -> dict:
-        lead = Lead(**data.model_dump())
+        lead = new_lead(**data.model_dump())
+        if lead.user_id:
+            existing = await self.session.exec(
+                select(Lead.id).where(Lead.user_id == lead.user_id, Lead.identity_hash == lead.identity_hash)
+            )
+            if existing.first():
+                raise HTTPException(status_code=400, detail="Lead for this business already exists")
         self.session.add(lead)
+        await LeadStatsService(self.session).record(added=[stats_key(lead)])
         await self.session.commit()
         await self.session.refresh(lead)
         return lead.model_dump()
@@ -82,6 +269,7 @@ class LeadService:
 
         # Convert update data to dict, excluding unset fields
         update_data = data.model_dump(exclude_unset=True)
+        old_stats_key = stats_key(lead)
 
         # Update only the fields provided in the request 
         for key, value in update_data.items():
@@ -89,6 +277,9 @@ class LeadService:
 
         # Save changes
         self.session.add(lead)
+        new_stats_key = stats_key(lead)
+        if new_stats_key != old_stats_key:
+            await LeadStatsService(self.session).record(added=[new_stats_key], removed=[old_stats_key])
         await self.session.commit()
         await self.session.refresh(lead)
 
@@ -100,6 +291,142 @@ class LeadService:
         if not lead:
             return False
         await self.session.delete(lead)
+        await LeadStatsService(self.session).record(removed=[stats_key(lead)])
         await self.session.commit()
         return True
- 
\ No newline at end of file
+
+    def _bulk_target(
+        self,
+        user_id: uuid.UUID,
+        ids: Optional[List[uuid.UUID]],
+        lead_filter: Optional[LeadFilter],
+    ) -> list:
+        """WHERE clauses for a bulk operation, always scoped to the user"""
+        # An empty filter ({} or only blank fields) would match every lead the user has
+        criteria = {
+            field: value for field, value in (lead_filter.model_dump() if lead_filter else {}).items()
+            if value is not None and value != ""
+        }
+        if ids is None and not criteria:
+            raise HTTPException(status_code=400, detail="Provide ids and/or a non-empty filter")
+        conditions = _lead_filters(user_id=user_id, **criteria)
+        if ids is not None:
+            # One array parameter (id = ANY(:ids)) however many ids are sent
+            conditions.append(Lead.id == any_(bindparam("ids", ids, type_=ARRAY(UUID(as_uuid=True)))))
+        return conditions
+
+    async def bulk_update(
+        self,
+        user_id: uuid.UUID,
+        changes: LeadUpdate,
+        ids: Optional[List[uuid.UUID]] = None,
+        lead_filter: Optional[LeadFilter] = None,
+    ) -> int:
+        """Apply the same changes to all matching leads in one UPDATE; returns the row count"""
+        values = changes.model_dump(exclude_unset=True)
+        if not values:
+            raise HTTPException(status_code=400, detail="No changes given")
+        if "email" in values:
+            raise HTTPException(status_code=400, detail="email is unique and cannot be bulk-updated")
+        nulled = sorted(field for field, value in values.items() if value is None and not Lead.__table__.c[field].nullable)
+        if nulled:
+            raise HTTPException(status_code=400, detail=f"Cannot set required fields to null: {', '.join(nulled)}")
+        values["updated_at"] = datetime.now(timezone.utc)
+
+        result = await self.session.exec(
+            update(Lead)
+            .where(*self._bulk_target(user_id, ids, lead_filter))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if STATS_FIELDS & values.keys() and result.rowcount:
+            await LeadStatsService(self.session).rebuild(user_id)
+        await self.session.commit()
+        return result.rowcount
+
+    async def bulk_delete(
+        self,
+        user_id: uuid.UUID,
+        ids: Optional[List[uuid.UUID]] = None,
+        lead_filter: Optional[LeadFilter] = None,
+    ) -> int:
+        """Delete all matching leads in one DELETE; returns the row count"""
+        result = await self.session.exec(
+            delete(Lead)
+            .where(*self._bulk_target(user_id, ids, lead_filter))
+            .returning(Lead.user_id, Lead.industry, Lead.lead_score, Lead.verified)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.all()
+        await LeadStatsService(self.session).record(removed=[stats_key(row) for row in deleted])
+        await self.session.commit()
+        return len(deleted)
+
+    async def get_stats(self, user_id: uuid.UUID) -> dict:
+        return await LeadStatsService(self.session).get_stats(user_id)
+
+    async def get_enrichment_status(self, user_id: uuid.UUID, lead_ids: List[uuid.UUID]) -> dict:
+        result = await self.session.exec(
+            select(Lead).where(Lead.user_id == user_id, Lead.id.in_(lead_ids))
+        )
+        leads = result.all()
+
+        counts = {ENRICHMENT_PENDING: 0, ENRICHMENT_PROCESSING: 0, ENRICHMENT_DONE: 0, ENRICHMENT_FAILED: 0}
+        for lead in leads:
+            counts[lead.enrichment_status] = counts.get(lead.enrichment_status, 0) + 1
+
+        return {**counts, "leads": [lead.model_dump() for lead in leads]}
+
+
+# -----------------------
+# Export
+# -----------------------
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _export_chunk(rows, fmt: str) -> str:
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps({k: _export_value(v) for k, v in row._mapping.items()}) + "\n" for row in rows
+        )
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_export_value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def export_leads(
+    fmt: str,
+    user_id: uuid.UUID,
+    industry: Optional[str] = None,
+    min_lead_score: Optional[int] = None,
+    max_lead_score: Optional[int] = None,
+    q: Optional[str] = None,
+    fields: List[str] = LEAD_READ_FIELDS,
+) -> AsyncIterator[str]:
+    """Yield the user's leads (same filters as list_leads, newest first) as
+    CSV with a header row or as NDJSON, EXPORT_BATCH_SIZE rows at a time.
+
+    Rows come from a server-side cursor, so memory stays flat however many
+    leads match. Runs as a streaming body, so it uses its own async_session().
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        yield buffer.getvalue()
+
+    filters = _lead_filters(user_id, industry, min_lead_score, max_lead_score, q)
+    query = (
+        select(*_columns(fields))
+        .where(*filters)
+        .order_by(Lead.created_at.desc(), Lead.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async with async_session() as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield _export_chunk(rows, fmt)
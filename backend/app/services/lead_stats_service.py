@@ -0,0 +1,130 @@
+import uuid
+from collections import defaultdict
+from typing import Iterable, Optional, Tuple
+from sqlmodel import select, delete, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Integer, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from app.models.lead import Lead
+from app.models.lead_stats import LeadStat, score_bucket, SCORE_BUCKETS, SCORE_BUCKET_WIDTH
+
+# (user_id, industry, score bucket, verified) of one lead, as counted in lead_stats
+StatsKey = Tuple[uuid.UUID, str, int, bool]
+
+
+def stats_key(lead) -> Optional[StatsKey]:
+    """What a lead contributes to lead_stats; None for leads without a user"""
+    if lead.user_id is None:
+        return None
+    return (lead.user_id, lead.industry, score_bucket(lead.lead_score), bool(lead.verified))
+
+
+class LeadStatsService:
+    """Maintains and reads the lead_stats summary table.
+
+    record() only adds statements to the caller's transaction; call it before
+    the commit that writes the leads so counts and rows change together.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(
+        self,
+        added: Iterable[Optional[StatsKey]] = (),
+        removed: Iterable[Optional[StatsKey]] = (),
+    ) -> None:
+        deltas: dict = defaultdict(lambda: [0, 0])
+        for sign, keys in ((1, added), (-1, removed)):
+            for key in keys:
+                if key is None:
+                    continue
+                user_id, industry, bucket, verified = key
+                delta = deltas[(user_id, industry, bucket)]
+                delta[0] += sign
+                delta[1] += sign if verified else 0
+
+        # Sorted, so concurrent upserts lock stats rows in the same order
+        rows = [
+            {"user_id": user_id, "industry": industry, "score_bucket": bucket, "total": total, "verified": verified}
+            for (user_id, industry, bucket), (total, verified) in sorted(deltas.items(), key=lambda d: (str(d[0][0]), *d[0][1:]))
+            if total or verified
+        ]
+        if not rows:
+            return
+
+        # Atomic increments, so concurrent writers never lose counts
+        stmt = insert(LeadStat).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LeadStat.user_id, LeadStat.industry, LeadStat.score_bucket],
+            set_={
+                "total": LeadStat.total + stmt.excluded.total,
+                "verified": LeadStat.verified + stmt.excluded.verified,
+            },
+        )
+        await self.session.exec(stmt)
+
+    async def rebuild(self, user_id: uuid.UUID) -> None:
+        """Recompute a user's stats from the leads table (backfill, or after
+        bulk writes that bypass record()). Does not commit."""
+        # Inline constants (not bind params) so the GROUP BY expression
+        # matches the selected one
+        bucket = func.least(
+            func.greatest(Lead.lead_score, literal_column("0", Integer))
+            // literal_column(str(SCORE_BUCKET_WIDTH), Integer),
+            literal_column(str(SCORE_BUCKETS - 1), Integer),
+        )
+        totals = (
+            select(
+                Lead.user_id,
+                Lead.industry,
+                bucket,
+                func.count(),
+                func.count().filter(Lead.verified),
+            )
+            .where(Lead.user_id == user_id)
+            .group_by(Lead.user_id, Lead.industry, bucket)
+        )
+        await self.session.exec(delete(LeadStat).where(LeadStat.user_id == user_id))
+        await self.session.exec(
+            insert(LeadStat).from_select(
+                ["user_id", "industry", "score_bucket", "total", "verified"], totals
+            )
+        )
+
+    async def get_stats(self, user_id: uuid.UUID) -> dict:
+        result = await self.session.exec(
+            select(LeadStat).where(LeadStat.user_id == user_id, LeadStat.total > 0)
+        )
+        rows = result.all()
+
+        industries: dict = defaultdict(lambda: {"total": 0, "verified": 0})
+        histogram = [0] * SCORE_BUCKETS
+        for row in rows:
+            industries[row.industry]["total"] += row.total
+            industries[row.industry]["verified"] += row.verified
+            histogram[row.score_bucket] += row.total
+
+        total = sum(i["total"] for i in industries.values())
+        verified = sum(i["verified"] for i in industries.values())
+        return {
+            "total": total,
+            "verified": verified,
+            "verified_ratio": verified / total if total else 0.0,
+            "industries": sorted(
+                (
+                    {**counts, "industry": industry, "verified_ratio": counts["verified"] / counts["total"]}
+                    for industry, counts in industries.items()
+                ),
+                key=lambda i: i["total"],
+                reverse=True,
+            ),
+            "score_histogram": [
+                {
+                    "min_score": b * SCORE_BUCKET_WIDTH,
+                    "max_score": (b + 1) * SCORE_BUCKET_WIDTH - 1 if b < SCORE_BUCKETS - 1 else 100,
+                    "count": count,
+                }
+                for b, count in enumerate(histogram)
+            ],
+        }
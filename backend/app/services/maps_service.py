@@ -0,0 +1,116 @@
+import asyncio
+import httpx
+from app.core.config import get_settings
+
+GEOCODE_ENDPOINT = "https://maps.googleapis.com/maps/api/geocode/json"
+PLACES_NEARBY_ENDPOINT = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+PLACE_DETAILS_ENDPOINT = "https://maps.googleapis.com/maps/api/place/details/json"
+
+# Google reports some transient failures in the response body with HTTP 200
+RETRYABLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+RETRYABLE_HTTP_CODES = {429, 500, 502, 503, 504}
+
+
+class MapsAPIError(Exception):
+    """Raised when the Google Maps API returns an unusable response."""
+
+
+class GoogleMapsClient:
+    """Async client for the Geocoding and Places web services.
+
+    A single instance keeps one pooled httpx.AsyncClient, so lookups share
+    connections instead of opening a new TLS session per call.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        max_connections: int = 20,
+    ):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def _get(self, url: str, params: dict) -> dict:
+        params = {**params, "key": self.api_key}
+        last_error: Exception | None = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Exponential backoff: 0.5s, 1s, 2s ...
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+            try:
+                response = await self._client.get(url, params=params)
+            except httpx.TransportError as e:
+                last_error = e
+                continue
+
+            if response.status_code in RETRYABLE_HTTP_CODES:
+                last_error = MapsAPIError(f"HTTP {response.status_code} from {url}")
+                continue
+            if response.is_error:
+                raise MapsAPIError(f"HTTP {response.status_code} from {url}")
+
+            data = response.json()
+            api_status = data.get("status")
+            if api_status in ("OK", "ZERO_RESULTS"):
+                return data
+            if api_status in RETRYABLE_STATUSES:
+                last_error = MapsAPIError(f"{api_status} from {url}")
+                continue
+            raise MapsAPIError(f"{api_status}: {data.get('error_message', 'unknown error')}")
+
+        raise MapsAPIError(f"Maps request failed after {self.max_retries + 1} attempts") from last_error
+
+    async def geocode(self, address: str) -> list[dict]:
+        data = await self._get(GEOCODE_ENDPOINT, {"address": address})
+        return data.get("results", [])
+
+    async def places_nearby(self, location: dict, radius: int, keyword: str) -> dict:
+        params = {
+            "location": f"{location['lat']},{location['lng']}",
+            "radius": radius,
+            "keyword": keyword,
+        }
+        return await self._get(PLACES_NEARBY_ENDPOINT, params)
+
+    async def place(self, place_id: str, fields: tuple[str, ...] | None = None) -> dict:
+        params = {"place_id": place_id}
+        if fields:
+            params["fields"] = ",".join(fields)
+        return await self._get(PLACE_DETAILS_ENDPOINT, params)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_maps_client: GoogleMapsClient | None = None
+
+
+def get_maps_client() -> GoogleMapsClient:
+    """Return the process-wide Maps client, creating it on first use."""
+    global _maps_client
+    if _maps_client is None:
+        settings = get_settings()
+        _maps_client = GoogleMapsClient(
+            api_key=settings.GOOGLE_MAPS_API_KEY,
+            timeout=settings.GOOGLE_MAPS_TIMEOUT_SECONDS,
+            max_retries=settings.GOOGLE_MAPS_MAX_RETRIES,
+            max_connections=settings.GOOGLE_MAPS_MAX_CONNECTIONS,
+        )
+    return _maps_client
+
+
+async def close_maps_client() -> None:
+    global _maps_client
+    if _maps_client is not None:
+        await _maps_client.aclose()
+        _maps_client = None
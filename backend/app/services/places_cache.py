@@ -0,0 +1,72 @@
+from cachetools import TTLCache
+from app.core.config import get_settings
+from app.services.geocode_cache import normalize_location
+
+settings = get_settings()
+
+
+class PlacesCache:
+    """In-memory TTL cache for Places lookups.
+
+    Nearby-search results are keyed by (industry, location, radius) and
+    place details by place_id, each with its own expiry. Hit/miss counters
+    are kept per tier and exposed through stats().
+    """
+
+    def __init__(self, nearby_maxsize: int, nearby_ttl: int, details_maxsize: int, details_ttl: int):
+        self._nearby: TTLCache = TTLCache(maxsize=nearby_maxsize, ttl=nearby_ttl)
+        self._details: TTLCache = TTLCache(maxsize=details_maxsize, ttl=details_ttl)
+        self._counters = {
+            "nearby": {"hits": 0, "misses": 0},
+            "details": {"hits": 0, "misses": 0},
+        }
+
+    @staticmethod
+    def _nearby_key(industry: str, location: str, radius: int) -> tuple:
+        return (normalize_location(industry), normalize_location(location), radius)
+
+    def _get(self, tier: str, cache: TTLCache, key):
+        value = cache.get(key)
+        self._counters[tier]["hits" if value is not None else "misses"] += 1
+        return value
+
+    def get_nearby(self, industry: str, location: str, radius: int) -> list | None:
+        return self._get("nearby", self._nearby, self._nearby_key(industry, location, radius))
+
+    def set_nearby(self, industry: str, location: str, radius: int, places: list) -> None:
+        self._nearby[self._nearby_key(industry, location, radius)] = places
+
+    def get_details(self, place_id: str) -> dict | None:
+        return self._get("details", self._details, place_id)
+
+    def set_details(self, place_id: str, details: dict) -> None:
+        self._details[place_id] = details
+
+    def stats(self) -> dict:
+        stats = {}
+        for tier, cache in (("nearby", self._nearby), ("details", self._details)):
+            counters = self._counters[tier]
+            lookups = counters["hits"] + counters["misses"]
+            stats[tier] = {
+                **counters,
+                "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+                "size": len(cache),
+                "max_size": cache.maxsize,
+                "ttl_seconds": cache.ttl,
+            }
+        return stats
+
+
+_places_cache: PlacesCache | None = None
+
+
+def get_places_cache() -> PlacesCache:
+    global _places_cache
+    if _places_cache is None:
+        _places_cache = PlacesCache(
+            nearby_maxsize=settings.PLACES_CACHE_MAX_ENTRIES,
+            nearby_ttl=settings.PLACES_NEARBY_CACHE_TTL_SECONDS,
+            details_maxsize=settings.PLACES_DETAILS_CACHE_MAX_ENTRIES,
+            details_ttl=settings.PLACES_DETAILS_CACHE_TTL_SECONDS,
+        )
+    return _places_cache
@@ -0,0 +1,139 @@
+import uuid
+from dataclasses import dataclass, field
+from cachetools import TTLCache
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import get_settings
+from app.models.authorization import Role, UserRole
+from app.models.users import User
+from app.services.authorization_matrix import AuthorizationMatrix, get_authorization_matrix
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What request handling needs to know about the caller: who they are,
+    whether they are active and their permissions as a bitmask over the
+    AuthorizationMatrix it was compiled against."""
+
+    id: uuid.UUID
+    is_active: bool
+    permission_mask: int
+    matrix: AuthorizationMatrix = field(compare=False, repr=False)
+    authz_version: int = 1
+
+    def has_permission(self, code: str) -> bool:
+        return bool(self.permission_mask & self.matrix.bit(code))
+
+    @property
+    def permissions(self) -> frozenset[str]:
+        return self.matrix.codes_for(self.permission_mask)
+
+
+class PrincipalCache:
+    """Per-process cache of principals by user id.
+
+    Entries expire after ttl_seconds. UserService and RoleService invalidate
+    them on writes in this process; the TTL bounds how long other workers
+    can serve a stale principal.
+
+    Also caches each user's (authz_version, is_active) for a shorter
+    version_ttl_seconds, which is all that is needed to trust the
+    permissions embedded in an access token.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int, version_ttl_seconds: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._versions: TTLCache = TTLCache(maxsize=maxsize, ttl=version_ttl_seconds)
+
+    async def get(self, session: AsyncSession, user_id: uuid.UUID) -> Principal | None:
+        principal = self._cache.get(user_id)
+        if principal is None:
+            principal = await self._load(session, user_id)
+            if principal is not None:
+                self._cache[user_id] = principal
+        return principal
+
+    async def _load(self, session: AsyncSession, user_id: uuid.UUID) -> Principal | None:
+        # One query: the user row outer-joined to its role names; the
+        # matrix turns the roles into a permission mask
+        result = await session.exec(
+            select(User.id, User.is_active, User.authz_version, Role.name)
+            .outerjoin(UserRole, UserRole.user_id == User.id)
+            .outerjoin(Role, Role.id == UserRole.role_id)
+            .where(User.id == user_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        matrix = await get_authorization_matrix(session)
+        return Principal(
+            id=rows[0].id,
+            is_active=rows[0].is_active,
+            permission_mask=matrix.role_mask(row.name for row in rows if row.name is not None),
+            matrix=matrix,
+            authz_version=rows[0].authz_version,
+        )
+
+    async def from_claims(self, session: AsyncSession, claims: dict) -> Principal | None:
+        """Principal built from the permissions embedded in an access token,
+        or None when the token has none or they may be out of date (the
+        user's authz_version moved on or the authorization matrix changed)."""
+        if "perm" not in claims:
+            return None
+        user_id = claims["sub"]
+
+        state = self._versions.get(user_id)
+        if state is None:
+            result = await session.exec(select(User.authz_version, User.is_active).where(User.id == user_id))
+            state = result.one_or_none()
+            if state is None:
+                return None
+            self._versions[user_id] = state = tuple(state)
+        authz_version, is_active = state
+        if claims.get("av") != authz_version:
+            return None
+
+        matrix = await get_authorization_matrix(session)
+        if claims.get("pc") != matrix.fingerprint:
+            return None
+        return Principal(
+            id=user_id,
+            is_active=is_active,
+            permission_mask=int(claims["perm"], 16),
+            matrix=matrix,
+            authz_version=authz_version,
+        )
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._cache.pop(user_id, None)
+        self._versions.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after a role's permissions change"""
+        self._cache.clear()
+        self._versions.clear()
+
+
+async def bump_role_authz_version(session: AsyncSession, role_id: uuid.UUID) -> None:
+    """Invalidate tokens issued to every holder of a role (caller commits)"""
+    await session.exec(
+        update(User)
+        .where(User.id.in_(select(UserRole.user_id).where(UserRole.role_id == role_id)))
+        .values(authz_version=User.authz_version + 1)
+    )
+
+
+_principal_cache: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+            version_ttl_seconds=settings.AUTHZ_VERSION_CACHE_TTL_SECONDS,
+        )
+    return _principal_cache
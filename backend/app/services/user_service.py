@@ -7,7 +7,8 @@ from sqlalchemy.orm import selectinload
 from app.models.users import User
 from app.models.authorization import Role
 from app.schemas.users import UserCreate, UserUpdate, UserRead
-from app.core.security import hash_password
+from app.core.security import hash_password_async
+from app.services.principal_cache import get_principal_cache
 
 class UserService:
     def __init__(self, session: AsyncSession):
@@ -41,7 +42,7 @@ class UserService:
         user = User(
             username=data.username,
             email=data.email,
-            password_hash=hash_password(data.password)
+            password_hash=await hash_password_async(data.password)
         )
 
         # assign roles
@@ -83,19 +84,22 @@ class UserService:
         if data.email is not None:
             user.email = data.email
         if data.password is not None:
-            user.password_hash = hash_password(data.password)
+            user.password_hash = await hash_password_async(data.password)
         if data.is_active is not None:
             user.is_active = data.is_active
+            user.authz_version += 1
 
         if data.role_ids is not None:
             roles_result = await self.session.exec(
                 select(Role).where(Role.id.in_(data.role_ids))
             )
             user.roles = roles_result.all()
+            user.authz_version += 1
 
         self.session.add(user)
         await self.session.commit()
         await self.session.refresh(user)
+        get_principal_cache().invalidate(user_id)
 
         return UserRead.model_validate(user, from_attributes=True)
 
@@ -106,3 +110,4 @@ class UserService:
 
         await self.session.delete(user)
         await self.session.commit()
+        get_principal_cache().invalidate(user_id)
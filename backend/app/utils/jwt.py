@@ -1,5 +1,8 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4, UUID
+from cachetools import LRUCache
 from jose import jwt, JWTError, ExpiredSignatureError
 from app.core.config import get_settings
 from fastapi import HTTPException, status
@@ -8,9 +11,25 @@ settings = get_settings()
 ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 
-def create_access_token(user_id: UUID, expires_minutes: int = 15) -> str:
+# Verified access-token claims by sha256(token). The same token arrives on
+# every request for its whole lifetime, so this skips the HMAC check and
+# JSON decode on repeats. Entries are never served past their exp.
+_verified_tokens: LRUCache = LRUCache(maxsize=settings.JWT_CACHE_MAX_ENTRIES)
+
+def create_access_token(
+    user_id: UUID,
+    expires_minutes: int = 15,
+    permissions: int | None = None,
+    authz_version: int | None = None,
+    catalog: str | None = None,
+) -> str:
+    """Access token for user_id. With `permissions` (an AuthorizationMatrix
+    mask), also embeds the grants so checks can be decided from the token
+    alone: "perm" (hex mask), "pc" (matrix fingerprint), "av" (user authz_version)."""
     expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
     to_encode = {"sub": str(user_id), "exp": expire}
+    if permissions is not None:
+        to_encode.update(perm=format(permissions, "x"), pc=catalog, av=authz_version)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def create_refresh_token(user_id: UUID, expires_days: int = 7) -> str:
@@ -18,10 +37,26 @@ def create_refresh_token(user_id: UUID, expires_days: int = 7) -> str:
     to_encode = {"sub": str(user_id), "jti": str(uuid4()), "type": "refresh", "exp": expire}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def verify_token(token: str) -> UUID | None:
+def decode_access_token(token: str) -> dict:
+    """Verified claims of an access token (cached until the token expires)"""
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _verified_tokens.get(digest)
+    if claims is not None:
+        if claims["exp"] > time.time():
+            return dict(claims)
+        # Expired: drop it and let the full decode raise the usual error
+        del _verified_tokens[digest]
+
+    claims = _decode_access_token_uncached(token)
+    if "exp" in claims:
+        _verified_tokens[digest] = claims
+    return dict(claims)
+
+def _decode_access_token_uncached(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return UUID(payload.get("sub"))
+        payload["sub"] = UUID(payload.get("sub"))
+        return payload
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,6 +70,9 @@ def verify_token(token: str) -> UUID | None:
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+def verify_token(token: str) -> UUID | None:
+    return decode_access_token(token)["sub"]
+
 def verify_refresh_token(token: str) -> UUID:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -0,0 +1,29 @@
+"""Add enrichment_attempts to leads
+
+Revision ID: 0d4b7e1a9c52
+Revises: f2a6c9d4b817
+Create Date: 2026-10-18 19:20:13.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d4b7e1a9c52'
+down_revision: Union[str, Sequence[str], None] = 'f2a6c9d4b817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leads', sa.Column('enrichment_attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('leads', 'enrichment_attempts')
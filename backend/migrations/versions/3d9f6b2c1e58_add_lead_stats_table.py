@@ -0,0 +1,48 @@
+"""Add lead_stats table
+
+Revision ID: 3d9f6b2c1e58
+Revises: a61f0c8e25d4
+Create Date: 2026-10-18 14:02:11.384920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9f6b2c1e58'
+down_revision: Union[str, Sequence[str], None] = 'a61f0c8e25d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('lead_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('industry', sa.String(), nullable=False),
+    sa.Column('score_bucket', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('verified', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'industry', 'score_bucket')
+    )
+    # Backfill from existing leads
+    op.execute(
+        """
+        INSERT INTO lead_stats (user_id, industry, score_bucket, total, verified)
+        SELECT user_id, industry, LEAST(GREATEST(lead_score, 0) / 10, 9),
+               count(*), count(*) FILTER (WHERE verified)
+        FROM leads
+        WHERE user_id IS NOT NULL
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('lead_stats')
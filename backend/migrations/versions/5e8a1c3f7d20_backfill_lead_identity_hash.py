@@ -0,0 +1,60 @@
+"""Backfill identity_hash for leads created outside chat
+
+Revision ID: 5e8a1c3f7d20
+Revises: 0d4b7e1a9c52
+Create Date: 2026-10-18 19:48:55.210736
+
+"""
+import hashlib
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a1c3f7d20'
+down_revision: Union[str, Sequence[str], None] = '0d4b7e1a9c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _identity_hash(place_id, business_name, address) -> str:
+    # Frozen copy of app.models.lead.lead_identity_hash
+    if place_id:
+        identity = f"place:{place_id}"
+    else:
+        normalize = lambda value: re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (value or "").lower())).strip()
+        identity = f"name:{normalize(business_name)}|{normalize(address)}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    taken = {
+        (row.user_id, row.identity_hash)
+        for row in bind.execute(sa.text("SELECT user_id, identity_hash FROM leads WHERE identity_hash IS NOT NULL"))
+    }
+    rows = bind.execute(sa.text(
+        "SELECT id, user_id, place_id, business_name, address FROM leads "
+        "WHERE identity_hash IS NULL ORDER BY created_at"
+    )).all()
+    updates = []
+    for row in rows:
+        identity_hash = _identity_hash(row.place_id, row.business_name, row.address)
+        # Existing duplicates of one business keep NULL (the oldest gets the hash)
+        if (row.user_id, identity_hash) in taken:
+            continue
+        taken.add((row.user_id, identity_hash))
+        updates.append({"id": row.id, "identity_hash": identity_hash})
+    if updates:
+        bind.execute(sa.text("UPDATE leads SET identity_hash = :identity_hash WHERE id = :id"), updates)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Hashes are indistinguishable from ones written by the app; nothing to undo
+    pass
@@ -0,0 +1,31 @@
+"""Add enrichment_status to leads
+
+Revision ID: 5f1c2a9d7e34
+Revises: db21f2c1ea45
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c2a9d7e34'
+down_revision: Union[str, Sequence[str], None] = 'db21f2c1ea45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leads', sa.Column('enrichment_status', sa.String(length=20), server_default='done', nullable=False))
+    op.create_index(op.f('ix_leads_enrichment_status'), 'leads', ['enrichment_status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_leads_enrichment_status'), table_name='leads')
+    op.drop_column('leads', 'enrichment_status')
@@ -0,0 +1,37 @@
+"""Add place_id, identity_hash and enriched_at to leads
+
+Revision ID: 7c2e9a4f1b36
+Revises: 3d9f6b2c1e58
+Create Date: 2026-10-18 15:11:37.529184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a4f1b36'
+down_revision: Union[str, Sequence[str], None] = '3d9f6b2c1e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leads', sa.Column('place_id', sa.String(), nullable=True))
+    op.add_column('leads', sa.Column('identity_hash', sa.String(length=64), nullable=True))
+    op.add_column('leads', sa.Column('enriched_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_leads_user_id_identity_hash', 'leads', ['user_id', 'identity_hash'], unique=True)
+    # Already-scored leads count as enriched when they were last written
+    op.execute("UPDATE leads SET enriched_at = updated_at WHERE enrichment_status = 'done'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_leads_user_id_identity_hash', table_name='leads')
+    op.drop_column('leads', 'enriched_at')
+    op.drop_column('leads', 'identity_hash')
+    op.drop_column('leads', 'place_id')
@@ -0,0 +1,32 @@
+"""Allow negative geocode_cache entries (NULL lat/lng)
+
+Revision ID: 8f3b6d2e4a71
+Revises: 5e8a1c3f7d20
+Create Date: 2026-10-18 20:14:02.587341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b6d2e4a71'
+down_revision: Union[str, Sequence[str], None] = '5e8a1c3f7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('geocode_cache', 'lat', existing_type=sa.Float(), nullable=True)
+    op.alter_column('geocode_cache', 'lng', existing_type=sa.Float(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM geocode_cache WHERE lat IS NULL OR lng IS NULL")
+    op.alter_column('geocode_cache', 'lng', existing_type=sa.Float(), nullable=False)
+    op.alter_column('geocode_cache', 'lat', existing_type=sa.Float(), nullable=False)
@@ -0,0 +1,33 @@
+"""Add composite per-user lead indexes
+
+Revision ID: a61f0c8e25d4
+Revises: e8d15f3a0b67
+Create Date: 2026-10-18 14:20:33.670158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61f0c8e25d4'
+down_revision: Union[str, Sequence[str], None] = 'e8d15f3a0b67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_leads_user_id_created_at', 'leads', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_leads_user_id_lead_score', 'leads', ['user_id', 'lead_score', 'id'], unique=False)
+    op.create_index('ix_leads_user_id_industry', 'leads', ['user_id', 'industry'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_leads_user_id_industry', table_name='leads')
+    op.drop_index('ix_leads_user_id_lead_score', table_name='leads')
+    op.drop_index('ix_leads_user_id_created_at', table_name='leads')
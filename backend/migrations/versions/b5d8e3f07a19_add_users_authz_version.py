@@ -0,0 +1,29 @@
+"""Add users.authz_version
+
+Revision ID: b5d8e3f07a19
+Revises: 7c2e9a4f1b36
+Create Date: 2026-10-18 16:24:05.771230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d8e3f07a19'
+down_revision: Union[str, Sequence[str], None] = '7c2e9a4f1b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('authz_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'authz_version')
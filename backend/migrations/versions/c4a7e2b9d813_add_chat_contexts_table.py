@@ -0,0 +1,37 @@
+"""Add chat_contexts table
+
+Revision ID: c4a7e2b9d813
+Revises: 9b3e4d1f6a20
+Create Date: 2026-10-18 12:26:53.906712
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2b9d813'
+down_revision: Union[str, Sequence[str], None] = '9b3e4d1f6a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_contexts',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_chat_contexts_expires_at'), 'chat_contexts', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chat_contexts_expires_at'), table_name='chat_contexts')
+    op.drop_table('chat_contexts')
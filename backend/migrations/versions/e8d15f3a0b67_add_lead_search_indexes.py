@@ -0,0 +1,48 @@
+"""Add trigram and full-text search indexes to leads
+
+Revision ID: e8d15f3a0b67
+Revises: c4a7e2b9d813
+Create Date: 2026-10-18 13:41:09.215377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8d15f3a0b67'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e2b9d813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('leads', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(business_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(industry, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'C') || "
+            "setweight(to_tsvector('english', coalesce(address, '')), 'D')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_leads_search_vector', 'leads', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_leads_industry_trgm', 'leads', ['industry'], unique=False, postgresql_using='gin', postgresql_ops={'industry': 'gin_trgm_ops'})
+    op.create_index('ix_leads_business_name_trgm', 'leads', ['business_name'], unique=False, postgresql_using='gin', postgresql_ops={'business_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_leads_business_name_trgm', table_name='leads')
+    op.drop_index('ix_leads_industry_trgm', table_name='leads')
+    op.drop_index('ix_leads_search_vector', table_name='leads')
+    op.drop_column('leads', 'search_vector')
@@ -0,0 +1,30 @@
+"""Add enrichment_claimed_at to leads
+
+Revision ID: f2a6c9d4b817
+Revises: b5d8e3f07a19
+Create Date: 2026-10-18 18:02:41.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c9d4b817'
+down_revision: Union[str, Sequence[str], None] = 'b5d8e3f07a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leads', sa.Column('enrichment_claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE leads SET enrichment_status = 'pending' WHERE enrichment_status = 'processing'")
+    op.drop_column('leads', 'enrichment_claimed_at')
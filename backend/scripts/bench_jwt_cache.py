@@ -0,0 +1,49 @@
+"""Per-request access-token verification cost, with and without the
+verified-token cache in app.utils.jwt.
+
+Simulates a set of active users each sending many requests with the same
+token: "uncached" runs the full python-jose decode + HMAC check every time,
+"cached" goes through decode_access_token.
+
+Run from backend/ (needs the APP_* settings, e.g. a .env file):
+
+    python -m scripts.bench_jwt_cache --users 500 --requests 50
+"""
+import argparse
+import random
+import time
+import uuid
+
+from app.utils import jwt as jwt_utils
+
+
+def bench(decode, tokens: list[str], requests: int) -> float:
+    """Mean microseconds per verification"""
+    stream = [token for token in tokens for _ in range(requests)]
+    random.shuffle(stream)
+    start = time.perf_counter()
+    for token in stream:
+        decode(token)
+    return (time.perf_counter() - start) / len(stream) * 1e6
+
+
+def main(users: int, requests: int) -> None:
+    tokens = [
+        jwt_utils.create_access_token(uuid.uuid4(), permissions=0b1011, authz_version=1, catalog="bench")
+        for _ in range(users)
+    ]
+    jwt_utils._verified_tokens.clear()
+
+    uncached = bench(jwt_utils._decode_access_token_uncached, tokens, requests)
+    cached = bench(jwt_utils.decode_access_token, tokens, requests)
+    print(f"{users} tokens x {requests} requests")
+    print(f"uncached: {uncached:7.2f} us/request")
+    print(f"cached:   {cached:7.2f} us/request  ({uncached / cached:.1f}x faster, first use of each token included)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500, help="distinct tokens")
+    parser.add_argument("--requests", type=int, default=50, help="requests per token")
+    args = parser.parse_args()
+    main(args.users, args.requests)
@@ -0,0 +1,92 @@
+"""Login burst benchmark: bcrypt on the event loop vs. on the password pool.
+
+Serves a minimal app in-process (no database) with one login-like endpoint
+per mode and a trivial /ping endpoint. For each mode it fires a burst of
+concurrent logins while pinging, then reports login throughput and the
+/ping latency other requests see during the burst.
+
+Run from backend/ (needs the APP_* settings, e.g. a .env file):
+
+    python -m scripts.bench_password_hashing --logins 40
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.security import hash_password, verify_password, verify_password_async, shutdown_password_pool
+
+PASSWORD = "correct horse battery staple"
+
+app = FastAPI()
+password_hash = hash_password(PASSWORD)
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+@app.post("/login/sync")
+async def login_sync():
+    return {"ok": verify_password(PASSWORD, password_hash)}
+
+
+@app.post("/login/async")
+async def login_async():
+    return {"ok": await verify_password_async(PASSWORD, password_hash)}
+
+
+async def run(mode: str, logins: int, ping_interval: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        burst_done = asyncio.Event()
+        ping_latencies = []
+
+        async def pinger():
+            # Latency is measured from when each ping was due, so time spent
+            # waiting for a blocked event loop counts against it
+            due = time.perf_counter()
+            while not burst_done.is_set():
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - due)
+                due += ping_interval
+
+        ping_task = asyncio.create_task(pinger())
+        start = time.perf_counter()
+        await asyncio.gather(*(client.post(f"/login/{mode}") for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        burst_done.set()
+        await ping_task
+
+    ping_ms = sorted(l * 1000 for l in ping_latencies)
+    return {
+        "logins_per_s": logins / elapsed,
+        "ping_p50_ms": statistics.median(ping_ms),
+        "ping_max_ms": ping_ms[-1],
+        "pings": len(ping_ms),
+    }
+
+
+async def main(logins: int, ping_interval: float) -> None:
+    # Start the pool workers before timing
+    await verify_password_async(PASSWORD, password_hash)
+    for mode in ("sync", "async"):
+        r = await run(mode, logins, ping_interval)
+        print(
+            f"{mode:6} logins/s={r['logins_per_s']:7.1f}  "
+            f"/ping p50={r['ping_p50_ms']:8.1f}ms  max={r['ping_max_ms']:8.1f}ms  ({r['pings']} pings)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40, help="concurrent logins per burst")
+    parser.add_argument("--ping-interval", type=float, default=0.01, help="seconds between pings")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.ping_interval))
+    shutdown_password_pool()
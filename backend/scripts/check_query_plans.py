@@ -0,0 +1,160 @@
+"""Query plan regression check for LeadService.
+
+Seeds a local Postgres database (inside a transaction that is rolled back),
+runs EXPLAIN on every query LeadService builds for the lead list, page and
+count endpoints and exits non-zero if any of them plans a sequential scan
+of the leads table.
+
+Run from backend/ against a migrated local database:
+
+    python -m scripts.check_query_plans --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.db.base  # noqa: F401  (registers all models)
+from app.core.config import get_settings
+from app.db.explain import Explain
+from app.services.lead_service import LeadService
+from app.utils.pagination import encode_cursor
+
+SEED_USERS_SQL = """
+INSERT INTO users (id, username, email, is_active, created_at, updated_at)
+SELECT gen_random_uuid(), 'plancheck_' || g, 'plancheck_' || g || '@example.com', true, now(), now()
+FROM generate_series(1, :users) AS g
+"""
+
+SEED_LEADS_SQL = """
+WITH u AS (SELECT array_agg(id) AS ids FROM users WHERE username LIKE 'plancheck\\_%')
+INSERT INTO leads (id, user_id, business_name, industry, lead_score, verified,
+                   summary, address, enrichment_status, created_at, updated_at)
+SELECT gen_random_uuid(),
+       u.ids[1 + g % :users],
+       'Business ' || g,
+       (ARRAY['restaurants', 'cafes', 'gyms', 'dentists', 'hotels', 'law firms'])[1 + g % 6],
+       g % 101,
+       g % 3 = 0,
+       'A friendly local business number ' || g,
+       g || ' Main Street',
+       'done',
+       now() - g * interval '1 minute',
+       now()
+FROM generate_series(1, :leads) AS g, u
+"""
+
+
+class _EmptyResult:
+    def __init__(self, plan=None):
+        self.plan = plan
+
+    def all(self):
+        return []
+
+    def one(self):
+        return 0
+
+    def scalar(self):
+        return self.plan
+
+
+class ExplainSession:
+    """Stands in for the AsyncSession given to LeadService: every statement
+    is EXPLAINed on the real session instead of executed."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.plans: list[dict] = []
+
+    async def exec(self, statement):
+        # count_mode="estimated" already sends an EXPLAIN; plan it as is
+        explained = isinstance(statement, Explain)
+        result = await self.session.execute(statement if explained else Explain(statement))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        self.plans.append(plan[0]["Plan"])
+        return _EmptyResult(plan if explained else None)
+
+
+def _seq_scans(plan: dict, table: str = "leads") -> list[dict]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == table:
+        found.append(plan)
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child, table))
+    return found
+
+
+def _scenarios(user_id: uuid.UUID):
+    mid_cursor = encode_cursor("created_at", datetime.now(timezone.utc) - timedelta(days=7), uuid.uuid4())
+    score_cursor = encode_cursor("lead_score", 50, uuid.uuid4())
+    return [
+        ("list: newest first", "list_leads", {}),
+        ("list: deep page by created_at", "list_leads", {"cursor": mid_cursor}),
+        ("list: by lead_score", "list_leads", {"sort": "lead_score"}),
+        ("list: deep page by lead_score", "list_leads", {"sort": "lead_score", "cursor": score_cursor}),
+        ("list: industry filter", "list_leads", {"industry": "rest"}),
+        ("list: score range", "list_leads", {"min_lead_score": 40, "max_lead_score": 60}),
+        ("list: full-text search", "list_leads", {"q": "friendly business"}),
+        ("page: exact total", "list_leads_with_total", {}),
+        ("page: exact total, industry", "list_leads_with_total", {"industry": "rest"}),
+        ("page: exact total, search", "list_leads_with_total", {"q": "friendly business"}),
+        ("page: estimated total", "list_leads_with_total", {"count_mode": "estimated"}),
+        ("page: estimated total, search", "list_leads_with_total", {"q": "friendly business", "count_mode": "estimated"}),
+        ("count: all", "count_leads", {}),
+        ("count: industry filter", "count_leads", {"industry": "rest"}),
+        ("count: full-text search", "count_leads", {"q": "friendly business"}),
+    ]
+
+
+async def main(database_url: str, users: int, leads: int) -> int:
+    engine = create_async_engine(database_url)
+    failures = 0
+
+    async with AsyncSession(engine) as session:
+        await session.execute(text(SEED_USERS_SQL), {"users": users})
+        await session.execute(text(SEED_LEADS_SQL), {"users": users, "leads": leads})
+        await session.execute(text("ANALYZE leads"))
+        user_id = (await session.execute(
+            text("SELECT id FROM users WHERE username = 'plancheck_1'")
+        )).scalar_one()
+
+        explain = ExplainSession(session)
+        service = LeadService(explain)
+        for name, method, kwargs in _scenarios(user_id):
+            # A scenario may issue several statements (page + total); check them all
+            first = len(explain.plans)
+            await getattr(service, method)(user_id=user_id, **kwargs)
+            plans = explain.plans[first:]
+            scans = [scan for plan in plans for scan in _seq_scans(plan)]
+            status = "FAIL (Seq Scan on leads)" if scans else "ok"
+            cost = max(plan["Total Cost"] for plan in plans)
+            print(f"{status:26} {name:32} cost={cost} ({len(plans)} statement(s))")
+            failures += bool(scans)
+
+        await session.rollback()
+
+    await engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to APP_DATABASE_URL")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--leads", type=int, default=100_000)
+    args = parser.parse_args()
+
+    failed = asyncio.run(main(args.database_url or get_settings().DATABASE_URL, args.users, args.leads))
+    if failed:
+        print(f"{failed} query plan(s) regressed to a sequential scan")
+        sys.exit(1)
+    print("All lead queries use indexes")